@@ -3,15 +3,39 @@ import argparse
 import os
 import hashlib
 import logging
+import mmap
+import queue
+import shutil
+import tarfile
+import threading
 from datetime import datetime
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
+
+# pygit2 is optional: when installed the clone runs in-process instead of forking git
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def run_command(command, error_message):
+# Clone tuning
+LFS_CONCURRENT_TRANSFERS = 16
+LFS_PULL_BATCH_SIZE = 64  # LFS files pulled per batch in --pipeline mode
+
+# Upload tuning
+UPLOAD_WORKERS = max(16, os.cpu_count() or 1)
+LARGE_FILE_THRESHOLD = 100 * 1024 * 1024  # Files above 100MB are uploaded in chunks
+LARGE_FILE_CHUNK_SIZE = 32 * 1024 * 1024
+LARGE_FILE_WORKERS = 8
+BUNDLE_CHUNK_SIZE = 8 * 1024 * 1024  # Resumable upload chunk size for tar bundles
+
+def run_command(command, error_message, env=None):
     try:
-        result = subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        result = subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
         logging.info(f"Command '{' '.join(command)}' executed successfully.")
         return True
     except subprocess.CalledProcessError as e:
@@ -22,11 +46,62 @@ def run_command(command, error_message):
         logging.error(f"Error: {e.stderr}")
         return None
 
+def clone_repository(repo_url, local_dir, include=None):
+    if include:
+        return sparse_clone_repository(repo_url, local_dir, include)
+
+    # libgit2 runs no LFS filters, so LFS files are checked out as pointers for lfs pull to fill in
+    if PYGIT2_AVAILABLE:
+        try:
+            pygit2.clone_repository(repo_url, local_dir, depth=1)
+            logging.info(f"Cloned {repo_url} into {local_dir} with pygit2.")
+            return True
+        except Exception as e:
+            logging.warning(f"pygit2 clone failed ({e}), falling back to git.")
+            shutil.rmtree(local_dir, ignore_errors=True)
+            os.makedirs(local_dir, exist_ok=True)
+
+    # Shallow, blobless snapshot of the default branch. LFS smudging is skipped during
+    # checkout so the objects are fetched by one batched, concurrent lfs pull.
+    clone_env = dict(os.environ, GIT_LFS_SKIP_SMUDGE="1")
+    return run_command(
+        ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch", repo_url, local_dir],
+        f"Failed to clone repository from {repo_url}",
+        env=clone_env,
+    )
+
+def sparse_clone_repository(repo_url, local_dir, include):
+    # Only the included paths are checked out, so blobs outside them are never downloaded
+    clone_env = dict(os.environ, GIT_LFS_SKIP_SMUDGE="1")
+    if not run_command(
+        ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch", "--no-checkout", repo_url, local_dir],
+        f"Failed to clone repository from {repo_url}",
+        env=clone_env,
+    ):
+        return None
+    if not run_command(
+        ["git", "-C", local_dir, "sparse-checkout", "set", "--no-cone", *include],
+        f"Failed to set sparse-checkout paths in {local_dir}",
+    ):
+        return None
+    return run_command(["git", "-C", local_dir, "checkout"], f"Failed to check out {local_dir}", env=clone_env)
+
+def lfs_pull(local_dir, include=None):
+    command = ["git", "-c", f"lfs.concurrenttransfers={LFS_CONCURRENT_TRANSFERS}", "-C", local_dir, "lfs", "pull"]
+    if include:
+        command += ["--include", ",".join(include)]
+    return run_command(command, f"Failed to pull Git LFS files in {local_dir}")
+
 def calculate_checksum(file_path):
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: the whole hash loop runs in C
+            sha256_hash = hashlib.file_digest(f, "sha256")
+        else:
+            sha256_hash = hashlib.sha256()
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    sha256_hash.update(mm)
     logging.info(f"Calculated checksum for {file_path}.")
     return sha256_hash.hexdigest()
 
@@ -35,19 +110,145 @@ def verify_clone(repo_path, expected_checksum, expected_size):
     logging.info("Verifying cloned repository (this is a placeholder).")
     return True
 
+def walk_files(directory, base_directory=None, exclude_dirs=()):
+    # Relative paths are sliced off a precomputed prefix instead of os.path.relpath, and always
+    # use "/" so they can be used directly as blob names
+    base_directory = base_directory or directory
+    prefix_len = len(os.path.join(base_directory, ""))
+    for root, dirs, files in os.walk(directory):
+        if exclude_dirs and root == directory:
+            dirs[:] = [d for d in dirs if d not in exclude_dirs]
+        for file in files:
+            local_file_path = os.path.join(root, file)
+            relative_path = local_file_path[prefix_len:]
+            if os.sep != "/":
+                relative_path = relative_path.replace(os.sep, "/")
+            yield local_file_path, relative_path
+
 def upload_to_gcs(local_directory, bucket_name, destination_blob_name):
     client = storage.Client()
     bucket = client.bucket(bucket_name)
-    for root, _, files in os.walk(local_directory):
-        for file in files:
-            local_file_path = os.path.join(root, file)
-            relative_path = os.path.relpath(local_file_path, local_directory)
-            blob_path = os.path.join(destination_blob_name, relative_path)
-            blob = bucket.blob(blob_path)
-            blob.upload_from_filename(local_file_path)
-            logging.info(f"Uploaded {local_file_path} to gs://{bucket_name}/{blob_path}")
 
-def main(repo_url, bucket_name):
+    small_files = []
+    large_files = []
+    for local_file_path, relative_path in walk_files(local_directory):
+        if os.path.getsize(local_file_path) > LARGE_FILE_THRESHOLD:
+            large_files.append((local_file_path, relative_path))
+        else:
+            small_files.append(relative_path)
+
+    # Small files: many concurrent uploads instead of one PUT at a time. Workers are
+    # processes, each with its own client, so CRC32C and TLS work isn't serialized by the GIL.
+    if small_files:
+        results = transfer_manager.upload_many_from_filenames(
+            bucket,
+            small_files,
+            source_directory=local_directory,
+            blob_name_prefix=f"{destination_blob_name}/",
+            skip_if_exists=True,
+            upload_kwargs={"checksum": "crc32c"},
+            worker_type=transfer_manager.PROCESS,
+            max_workers=UPLOAD_WORKERS,
+        )
+        for relative_path, result in zip(small_files, results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed to upload {relative_path}: {result}")
+            else:
+                logging.info(f"Uploaded {relative_path} to gs://{bucket_name}/{destination_blob_name}/{relative_path}")
+
+    # Large files: split each into chunks uploaded concurrently (XML multipart)
+    for local_file_path, relative_path in large_files:
+        blob_path = f"{destination_blob_name}/{relative_path}"
+        blob = bucket.blob(blob_path)
+        transfer_manager.upload_chunks_concurrently(
+            local_file_path,
+            blob,
+            chunk_size=LARGE_FILE_CHUNK_SIZE,
+            worker_type=transfer_manager.PROCESS,
+            max_workers=LARGE_FILE_WORKERS,
+        )
+        logging.info(f"Uploaded {local_file_path} to gs://{bucket_name}/{blob_path}")
+
+def upload_to_gcs_bundled(local_directory, bucket_name, destination_blob_name, compress=False):
+    """Stream the directory as a single tar object instead of one PUT per file."""
+    client = storage.Client()
+    bucket = client.bucket(bucket_name)
+    blob_path = f"{destination_blob_name}.tar.gz" if compress else f"{destination_blob_name}.tar"
+    blob = bucket.blob(blob_path)
+    file_count = 0
+    with blob.open("wb", chunk_size=BUNDLE_CHUNK_SIZE) as writer:
+        with tarfile.open(fileobj=writer, mode="w|gz" if compress else "w|") as tar:
+            for local_file_path, relative_path in walk_files(local_directory):
+                tar.add(local_file_path, arcname=relative_path, recursive=False)
+                file_count += 1
+    logging.info(f"Uploaded {file_count} files from {local_directory} to gs://{bucket_name}/{blob_path}")
+
+def upload_to_gcs_pipelined(local_directory, bucket_name, destination_blob_name):
+    """Upload files while git lfs pull is still fetching, instead of after it finishes."""
+    client = storage.Client()
+    bucket = client.bucket(bucket_name)
+    upload_queue = queue.Queue()
+
+    listing = subprocess.run(["git", "-C", local_directory, "lfs", "ls-files", "--name-only"],
+                             check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # Skip LFS files outside a sparse checkout
+    lfs_files = [path for path in listing.stdout.splitlines() if os.path.exists(os.path.join(local_directory, path))]
+    lfs_set = set(lfs_files)
+
+    def upload_worker():
+        while True:
+            relative_path = upload_queue.get()
+            if relative_path is None:
+                return
+            local_file_path = os.path.join(local_directory, relative_path)
+            blob_path = f"{destination_blob_name}/{relative_path}"
+            try:
+                blob = bucket.blob(blob_path)
+                if os.stat(local_file_path).st_size > LARGE_FILE_THRESHOLD:
+                    # Already on an upload thread, so the chunks go up on threads rather than processes
+                    transfer_manager.upload_chunks_concurrently(
+                        local_file_path,
+                        blob,
+                        chunk_size=LARGE_FILE_CHUNK_SIZE,
+                        worker_type=transfer_manager.THREAD,
+                        max_workers=LARGE_FILE_WORKERS,
+                    )
+                else:
+                    blob.upload_from_filename(local_file_path, checksum="crc32c")
+                logging.info(f"Uploaded {local_file_path} to gs://{bucket_name}/{blob_path}")
+            except Exception as e:
+                logging.error(f"Failed to upload {local_file_path}: {e}")
+
+    def enqueue_tree(directory, exclude_dirs=()):
+        for _, relative_path in walk_files(directory, local_directory, exclude_dirs):
+            if relative_path not in lfs_set:
+                upload_queue.put(relative_path)
+
+    workers = [threading.Thread(target=upload_worker, daemon=True) for _ in range(UPLOAD_WORKERS)]
+    for worker in workers:
+        worker.start()
+
+    # Regular files are already checked out and can go up straight away. .git is still
+    # being written to by lfs pull, so it is queued once the pull is done.
+    enqueue_tree(local_directory, exclude_dirs=(".git",))
+
+    # Pull LFS objects in batches, handing each batch to the uploaders as it lands
+    for i in range(0, len(lfs_files), LFS_PULL_BATCH_SIZE):
+        batch = lfs_files[i:i + LFS_PULL_BATCH_SIZE]
+        if lfs_pull(local_directory, include=batch):
+            for relative_path in batch:
+                upload_queue.put(relative_path)
+        else:
+            logging.error(f"Skipping upload of {len(batch)} LFS files that failed to pull")
+
+    enqueue_tree(os.path.join(local_directory, ".git"))
+
+    for _ in workers:
+        upload_queue.put(None)
+    for worker in workers:
+        worker.join()
+
+def main(repo_url, bucket_name, bundle=False, compress=False, pipeline=False, include=None):
     if not run_command(["git", "lfs", "install"], "Failed to install git-lfs"):
         return
 
@@ -59,9 +260,11 @@ def main(repo_url, bucket_name):
     logging.info(f"Created local directory {local_dir}.")
 
     # Step 2: Clone the repository locally
-    clone_output = run_command(["git", "clone", repo_url, local_dir], f"Failed to clone repository from {repo_url}")
+    clone_output = clone_repository(repo_url, local_dir, include)
     if clone_output:
-        lfs_clone = run_command(["git", "-C", local_dir, "lfs", "pull"], f"Failed to pull Git LFS files in {local_dir}")
+        # In pipeline mode LFS objects are pulled in batches while the upload runs
+        if bundle or not pipeline:
+            lfs_clone = lfs_pull(local_dir, include)
     else:
         logging.error("-E clone failed")
         raise
@@ -74,11 +277,20 @@ def main(repo_url, bucket_name):
         return
 
     # Step 4: Upload to GCS
-    upload_to_gcs(local_dir, bucket_name, os.path.basename(local_dir))
+    if bundle:
+        upload_to_gcs_bundled(local_dir, bucket_name, os.path.basename(local_dir), compress)
+    elif pipeline:
+        upload_to_gcs_pipelined(local_dir, bucket_name, os.path.basename(local_dir))
+    else:
+        upload_to_gcs(local_dir, bucket_name, os.path.basename(local_dir))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Clone a Git repository and upload to a GCS bucket.")
     parser.add_argument("repo_url", help="URL of the repository to clone")
     parser.add_argument("bucket_name", help="GCS bucket name where the repository should be uploaded")
+    parser.add_argument("--bundle", action="store_true", help="Upload the repository as a single tar object instead of one object per file")
+    parser.add_argument("--compress", action="store_true", help="Gzip the tar bundle (only with --bundle)")
+    parser.add_argument("--pipeline", action="store_true", help="Upload files while Git LFS objects are still being pulled")
+    parser.add_argument("--include", nargs="+", help="Only check out and upload these paths (git lfs pull -I style patterns)")
     args = parser.parse_args()
-    main(args.repo_url, args.bucket_name)
+    main(args.repo_url, args.bucket_name, args.bundle, args.compress, args.pipeline, args.include)
@@ -3,22 +3,48 @@
 Simplified JFrog File Uploader
 ------------------------------
 Uploads files to JFrog Artifactory with parallel processing for small files
-and sequential processing for large files.
+and a separate, smaller pool of concurrent streams for large files.
 """
 
 import os
 import sys
+import json
+import base64
+import http.client
+import urllib.parse
+import asyncio
+import contextlib
+import random
 import hashlib
+import mmap
 import argparse
 import logging
 import time
 import requests
+import urllib3
 import concurrent.futures
 import threading
 import psutil
+from operator import itemgetter
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
+# httpx is optional: when installed, small files are uploaded from a single
+# event loop over a shared connection pool instead of a thread pool
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# h2 enables HTTP/2 multiplexing in httpx
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,15 +58,21 @@ logger = logging.getLogger("JFrogUploader")
 
 # Constants
 DEFAULT_CONCURRENT_UPLOADS = 3
+DEFAULT_LARGE_CONCURRENT_UPLOADS = 2  # Parallel streams for files above the large threshold
 DEFAULT_STREAMS = 5  # Default number of streams for calculating chunk size
 DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB chunks default (used only if adaptive calculation fails)
 DEFAULT_LARGE_FILE_THRESHOLD = 100 * 1024 * 1024  # 100MB default threshold
 MAX_RETRIES = 3
 RETRY_BACKOFF_FACTOR = 1.0
+MAX_POOL_WAITS = 10  # Connection-pool-full waits allowed per upload (not counted as retries)
+POOL_TIMEOUT = 60  # Seconds a request waits for a free pooled connection before EmptyPoolError
 CONNECTION_TIMEOUT = 30
 READ_TIMEOUT = 300
 MIN_CHUNK_SIZE = 1 * 1024 * 1024  # 1MB minimum chunk size
 MAX_CHUNK_SIZE = 64 * 1024 * 1024  # 64MB maximum chunk size
+HASH_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB read buffer for checksum calculation
+PROGRESS_FLUSH_BYTES = 8 * 1024 * 1024  # Flush progress to the bar every 8MB...
+PROGRESS_FLUSH_INTERVAL = 0.25  # ...or every 250ms, whichever comes first
 
 def calculate_optimal_chunk_size(streams=DEFAULT_STREAMS):
     """
@@ -84,24 +116,88 @@ def calculate_optimal_chunk_size(streams=DEFAULT_STREAMS):
         logger.warning(f"Failed to calculate optimal chunk size: {str(e)}. Using default size.")
         return DEFAULT_CHUNK_SIZE
 
+class _TimedPoolMixin:
+    """Wait at most POOL_TIMEOUT for a free connection; requests never passes urllib3 a pool timeout."""
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(POOL_TIMEOUT if timeout is None else timeout)
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, urllib3.HTTPConnectionPool):
+    pass
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, urllib3.HTTPSConnectionPool):
+    pass
+
+class BlockingPoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools never open connections beyond pool_maxsize.
+    
+    A request that finds the pool full waits up to POOL_TIMEOUT for a connection
+    to be returned, then raises urllib3's EmptyPoolError.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(pool_block=True, **kwargs)
+
+    def _use_timed_pools(self, manager):
+        manager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool, 'https': _TimedHTTPSConnectionPool}
+        return manager
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self._use_timed_pools(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        return self._use_timed_pools(super().proxy_manager_for(proxy, **proxy_kwargs))
+
+def is_pool_exhausted(error):
+    """True when a request failed only because no pooled connection became free in time."""
+    causes = (error, error.__context__, error.args[0] if error.args else None)
+    return any(isinstance(cause, urllib3.exceptions.EmptyPoolError) for cause in causes)
+
 class UploadTracker:
-    """Tracks progress for a file upload."""
-    def __init__(self, file_path, total_size):
+    """Tracks progress for a file upload.
+    
+    Progress is counted locally and flushed to the progress bar in batches. When
+    a shared progress bar is passed in (directory uploads), one aggregate bar is
+    updated by every file instead of drawing a bar per file.
+    """
+    def __init__(self, file_path, total_size, progress_bar=None):
         self.file_path = file_path
         self.total_size = total_size
         self.uploaded = 0
+        self.pending = 0
         self.start_time = time.time()
-        self.lock = threading.Lock()
-        self.progress_bar = tqdm(total=total_size, unit='B', unit_scale=True, desc=os.path.basename(file_path))
+        self.last_flush = self.start_time
+        self.owns_progress_bar = progress_bar is None
+        if progress_bar is None:
+            progress_bar = tqdm(total=total_size, unit='B', unit_scale=True, desc=os.path.basename(file_path))
+        self.progress_bar = progress_bar
 
     def update(self, chunk_size):
-        with self.lock:
-            self.uploaded += chunk_size
-            self.progress_bar.update(chunk_size)
+        self.uploaded += chunk_size
+        self.pending += chunk_size
+        if self.pending >= PROGRESS_FLUSH_BYTES or time.time() - self.last_flush >= PROGRESS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            # tqdm's class-level lock guards the bar shared between upload threads
+            with self.progress_bar.get_lock():
+                self.progress_bar.update(self.pending)
+            self.pending = 0
+        self.last_flush = time.time()
+
+    def rewind(self):
+        """Take this file's bytes back off the progress bar before a retry sends it again."""
+        self.flush()
+        if self.uploaded:
+            with self.progress_bar.get_lock():
+                self.progress_bar.update(-self.uploaded)
+            self.uploaded = 0
 
     def close(self):
         try:
-            self.progress_bar.close()
+            self.flush()
+            if self.owns_progress_bar:
+                self.progress_bar.close()
             elapsed = time.time() - self.start_time
             rate = self.uploaded / elapsed / 1024 / 1024 if elapsed > 0 else 0
             logger.info(f"Upload of {os.path.basename(self.file_path)} completed in {elapsed:.2f}s "
@@ -113,12 +209,14 @@ class JFrogUploader:
     """Handles uploading files to JFrog Artifactory."""
     
     def __init__(self, base_url, repo_name, username, api_key, max_workers=DEFAULT_CONCURRENT_UPLOADS, 
-                 large_threshold=DEFAULT_LARGE_FILE_THRESHOLD, chunk_size=None):
+                 large_threshold=DEFAULT_LARGE_FILE_THRESHOLD, chunk_size=None,
+                 large_workers=DEFAULT_LARGE_CONCURRENT_UPLOADS, connection_limits=None):
         self.base_url = base_url.rstrip('/')
         self.repo_name = repo_name
         self.auth = (username, api_key)
         self.max_workers = max_workers
         self.large_threshold = large_threshold
+        self.large_workers = large_workers
         
         # Use provided chunk size or calculate optimal size
         if chunk_size is None:
@@ -127,102 +225,145 @@ class JFrogUploader:
             self.chunk_size = chunk_size
             
         self.session = requests.Session()
-        self.large_file_lock = threading.Lock()
+        # Size the connection pool to the worker count so threads don't wait on connections
+        pool_size = connection_limits or max(max_workers, large_workers)
+        self.connection_limits = pool_size
+        adapter = BlockingPoolAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.retry_semaphore = threading.BoundedSemaphore(max(max_workers, large_workers) * 2)
+        # sendfile uploads open their own connections outside the pool; cap them the same way
+        self.sendfile_slots = threading.BoundedSemaphore(pool_size)
     
     def calculate_md5(self, file_path):
         """Calculate MD5 hash of a file."""
         logger.debug(f"Calculating MD5 for {file_path}")
-        md5 = hashlib.md5()
-        
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                md5.update(chunk)
+            if hasattr(hashlib, 'file_digest'):
+                md5 = hashlib.file_digest(f, 'md5')
+            else:
+                md5 = hashlib.md5()
+                for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b''):
+                    md5.update(chunk)
         
         result = md5.hexdigest()
         logger.debug(f"MD5 hash: {result}")
         return result
     
-    def upload_file(self, file_path, target_path=None):
-        """Upload a single file to JFrog Artifactory."""
-        file_path = Path(file_path)
-        if not file_path.exists():
-            logger.error(f"File not found: {file_path}")
-            return False
+    def _build_url(self, target_path):
+        """Build the Artifactory URL for a repository path."""
+        return f"{self.base_url}/artifactory/{self.repo_name}/{target_path.lstrip('/')}"
+    
+    def upload_file(self, file_path, target_path=None, progress_bar=None, file_size=None):
+        """Upload a single file to JFrog Artifactory.
+        
+        file_size can be passed when the caller already has it from a directory
+        scan, which saves a stat() per file.
+        """
+        file_path = os.fspath(file_path)
+        if file_size is None:
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                logger.error(f"File not found: {file_path}")
+                return False
         
-        file_size = file_path.stat().st_size
         logger.info(f"Starting upload for {file_path} ({file_size/1024/1024:.2f} MB)")
         
         # If target path not specified, use the file name
         if target_path is None:
-            target_path = file_path.name
+            target_path = os.path.basename(file_path)
             
         # Remove leading slash if present
         target_path = target_path.lstrip('/')
         
         # Construct the full URL
-        url = f"{self.base_url}/artifactory/{self.repo_name}/{target_path}"
+        url = self._build_url(target_path)
         
         # Initialize progress tracker
-        tracker = UploadTracker(str(file_path), file_size)
+        tracker = UploadTracker(file_path, file_size, progress_bar)
         
         try:
-            # Calculate MD5 for all files
-            md5_hash = self.calculate_md5(file_path)
-            
-            # Upload based on file size
             if file_size >= self.large_threshold:
-                logger.info(f"File size {file_size/1024/1024:.2f} MB exceeds threshold of {self.large_threshold/1024/1024:.2f} MB, processing sequentially")
-                # Lock for large files to process one at a time
-                with self.large_file_lock:
-                    success = self._upload_with_streaming(file_path, url, file_size, tracker, md5_hash)
-            else:
-                # Small files can be uploaded in parallel
-                success = self._upload_with_streaming(file_path, url, file_size, tracker, md5_hash)
+                logger.info(f"File size {file_size/1024/1024:.2f} MB exceeds threshold of {self.large_threshold/1024/1024:.2f} MB")
+                # Plain HTTP can hand the file to the kernel with sendfile(2); HTTPS needs userspace TLS,
+                # and proxied requests go through the session
+                if (urllib.parse.urlsplit(url).scheme == 'http' and hasattr(os, 'sendfile')
+                        and self._proxy_for(url) is None):
+                    return self._upload_with_sendfile(file_path, url, file_size, tracker)
             
-            return success
+            return self._upload_with_streaming(file_path, url, file_size, tracker)
         except Exception as e:
             logger.error(f"Upload failed for {file_path}: {str(e)}")
             tracker.close()
             return False
     
-    def _upload_with_streaming(self, file_path, url, file_size, tracker, md5_hash):
-        """Upload a file with streaming and chunks to track progress."""
+    def _upload_with_streaming(self, file_path, url, file_size, tracker):
+        """Upload a file with streaming and chunks to track progress.
+        
+        The MD5 is calculated from the chunks as they are sent, so the file is
+        only read once, and is checked against the checksum Artifactory reports.
+        """
         logger.info(f"Uploading {file_path} with streaming (chunk size: {self.chunk_size/1024:.0f}KB)")
         
-        # Create headers with MD5 checksum
+        # The MD5 header is added once a full pass has produced the checksum
         headers = {
-            'Content-Type': 'application/octet-stream',
-            'X-Checksum-Md5': md5_hash
+            'Content-Type': 'application/octet-stream'
         }
         
         # Log the headers being used
         logger.debug(f"Request headers: {headers}")
         
-        # Create a generator to stream file content in chunks while tracking progress
-        def file_content_generator():
-            with open(file_path, 'rb') as f:
-                while True:
-                    chunk = f.read(self.chunk_size)
-                    if not chunk:
-                        break
-                    tracker.update(len(chunk))
-                    yield chunk
+        # Create a generator to stream file content in chunks while tracking progress.
+        # Chunks are memoryview slices of an mmap, so no per-chunk bytes copy is made.
+        def file_content_generator(md5):
+            if file_size == 0:
+                return
+            with open(file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                for offset in range(0, len(mm), self.chunk_size):
+                    with view[offset:offset + self.chunk_size] as chunk:
+                        md5.update(chunk)
+                        tracker.update(len(chunk))
+                        yield chunk
         
         # Upload with retries
-        for retry in range(MAX_RETRIES):
+        retry = 0
+        pool_waits = 0
+        while retry < MAX_RETRIES:
+            tracker.rewind()
+            md5 = hashlib.md5()
+            # Re-sent bodies share a bounded number of slots so retries can't flood an exhausted pool
+            retry_slot = self.retry_semaphore if retry > 0 else contextlib.nullcontext()
             try:
                 # Use a streaming upload
-                with self.session.put(
+                with retry_slot, self.session.put(
                     url,
-                    data=file_content_generator(),
+                    data=file_content_generator(md5),
                     headers=headers,
                     auth=self.auth,
                     timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT)
                 ) as response:
-                    if response.status_code in (200, 201):
+                    md5_hash = md5.hexdigest()
+                    logger.debug(f"MD5 hash: {md5_hash}")
+                    server_md5 = self._response_md5(response.text)
+                    
+                    if response.status_code in (200, 201) and server_md5 not in (None, md5_hash):
+                        # The body was corrupted in transit; resend with the header so the server rejects bad copies
+                        logger.warning(
+                            f"Checksum mismatch, retry {retry + 1}/{MAX_RETRIES}. "
+                            f"Local: {md5_hash}, Server: {server_md5}"
+                        )
+                        headers['X-Checksum-Md5'] = md5_hash
+                    elif response.status_code in (200, 201):
                         tracker.close()
                         logger.info(f"Upload successful for {file_path}")
-                        return self._validate_upload(url, file_path)
+                        return self._validate_upload(url, file_path, file_size)
+                    elif response.status_code == 408 and file_size >= self.large_threshold:
+                        # Re-sending a large body after a server timeout only adds to the load that caused it
+                        logger.error(f"Server timed out receiving {file_path} (408), not retrying large file")
+                        break
                     else:
                         logger.warning(
                             f"Upload failed, retry {retry + 1}/{MAX_RETRIES}. "
@@ -233,22 +374,127 @@ class JFrogUploader:
                         if "checksum" in response.text.lower():
                             logger.warning(f"Checksum error detected! Adding X-Checksum-Deploy header")
                             headers['X-Checksum-Deploy'] = 'true'
-                        
-                        # Wait longer for each retry
-                        backoff_time = RETRY_BACKOFF_FACTOR * (2 ** retry)
-                        logger.info(f"Waiting {backoff_time}s before retry...")
-                        time.sleep(backoff_time)
+                            headers['X-Checksum-Md5'] = md5_hash
+            except (requests.exceptions.ConnectionError, urllib3.exceptions.EmptyPoolError) as e:
+                if is_pool_exhausted(e) and pool_waits < MAX_POOL_WAITS:
+                    # Pool exhaustion is not a failure of this upload: wait with jitter, don't use up a retry
+                    pool_waits += 1
+                    wait_time = random.uniform(0, RETRY_BACKOFF_FACTOR)
+                    logger.warning(f"Connection pool exhausted, waiting {wait_time:.2f}s before resubmitting {file_path}")
+                    time.sleep(wait_time)
+                    continue
+                logger.warning(f"Upload exception, retry {retry + 1}/{MAX_RETRIES}: {str(e)}")
             except Exception as e:
                 logger.warning(f"Upload exception, retry {retry + 1}/{MAX_RETRIES}: {str(e)}")
-                backoff_time = RETRY_BACKOFF_FACTOR * (2 ** retry)
-                logger.info(f"Waiting {backoff_time}s before retry...")
-                time.sleep(backoff_time)
+            
+            # Wait longer for each retry
+            backoff_time = RETRY_BACKOFF_FACTOR * (2 ** retry)
+            logger.info(f"Waiting {backoff_time}s before retry...")
+            time.sleep(backoff_time)
+            retry += 1
         
         tracker.close()
         logger.error(f"Failed to upload {file_path} after {MAX_RETRIES} retries")
         return False
     
-    def _validate_upload(self, url, file_path):
+    def _upload_with_sendfile(self, file_path, url, file_size, tracker):
+        """Upload a large file over plain HTTP with sendfile(2).
+        
+        The body goes from the page cache to the socket without being copied
+        through Python, so the file is not hashed on the first attempt; the size
+        is checked after the upload. If an attempt fails, the MD5 is calculated
+        once and sent with each retry so Artifactory rejects a corrupted copy.
+        Retries share the same slots, 408 handling and backoff as streaming
+        uploads, and sendfile connections are capped at the connection limit.
+        """
+        logger.info(f"Uploading {file_path} with sendfile")
+        parts = urllib.parse.urlsplit(url)
+        credentials = base64.b64encode(f"{self.auth[0]}:{self.auth[1]}".encode()).decode()
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(file_size),
+            'Authorization': f"Basic {credentials}"
+        }
+        
+        for retry in range(MAX_RETRIES):
+            tracker.rewind()
+            if retry > 0 and 'X-Checksum-Md5' not in headers:
+                headers['X-Checksum-Md5'] = self.calculate_md5(file_path)
+            # Re-sent bodies share a bounded number of slots so retries can't flood the server
+            retry_slot = self.retry_semaphore if retry > 0 else contextlib.nullcontext()
+            with retry_slot, self.sendfile_slots:
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=READ_TIMEOUT)
+                try:
+                    conn.putrequest('PUT', requests.utils.requote_uri(parts.path))
+                    for name, value in headers.items():
+                        conn.putheader(name, value)
+                    conn.endheaders()
+                    
+                    with open(file_path, 'rb') as f:
+                        offset = 0
+                        while offset < file_size:
+                            sent = conn.sock.sendfile(f, offset, min(self.chunk_size, file_size - offset))
+                            if sent == 0:
+                                # Fail now instead of waiting READ_TIMEOUT for a response to a short body
+                                raise ConnectionError(f"Connection closed after {offset} of {file_size} bytes")
+                            offset += sent
+                            tracker.update(sent)
+                    
+                    response = conn.getresponse()
+                    body = response.read().decode(errors='replace')
+                    server_md5 = self._response_md5(body)
+                    local_md5 = headers.get('X-Checksum-Md5')
+                    
+                    if response.status in (200, 201) and local_md5 and server_md5 not in (None, local_md5):
+                        logger.warning(
+                            f"Checksum mismatch, retry {retry + 1}/{MAX_RETRIES}. "
+                            f"Local: {local_md5}, Server: {server_md5}"
+                        )
+                    elif response.status in (200, 201):
+                        tracker.close()
+                        logger.info(f"Upload successful for {file_path}")
+                        return self._validate_upload(url, file_path, file_size)
+                    elif response.status == 408:
+                        # Re-sending a large body after a server timeout only adds to the load that caused it
+                        logger.error(f"Server timed out receiving {file_path} (408), not retrying large file")
+                        break
+                    else:
+                        logger.warning(
+                            f"Upload failed, retry {retry + 1}/{MAX_RETRIES}. "
+                            f"Status: {response.status}, Response: {body}"
+                        )
+                except Exception as e:
+                    logger.warning(f"Upload exception, retry {retry + 1}/{MAX_RETRIES}: {str(e)}")
+                finally:
+                    conn.close()
+            
+            backoff_time = RETRY_BACKOFF_FACTOR * (2 ** retry)
+            logger.info(f"Waiting {backoff_time}s before retry...")
+            time.sleep(backoff_time)
+        
+        tracker.close()
+        logger.error(f"Failed to upload {file_path} after {MAX_RETRIES} retries")
+        return False
+    
+    def _proxy_for(self, url):
+        """Return the proxy the session would use for url (None when it connects directly)."""
+        proxies = dict(self.session.proxies)
+        if self.session.trust_env:
+            proxies = {**requests.utils.get_environ_proxies(url), **proxies}
+        return requests.utils.select_proxy(url, proxies)
+    
+    def _response_md5(self, response_text):
+        """Return the MD5 Artifactory reports in a deploy response, if any."""
+        try:
+            body = json.loads(response_text)
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        checksums = body.get('checksums')
+        return checksums.get('md5') if isinstance(checksums, dict) else None
+    
+    def _validate_upload(self, url, file_path, local_file_size=None):
         """Validate the uploaded file exists and has correct size."""
         logger.info(f"Validating upload for {url}")
         
@@ -264,7 +510,8 @@ class JFrogUploader:
             logger.info("File exists on server")
             
             # Check file size
-            local_file_size = os.path.getsize(str(file_path))
+            if local_file_size is None:
+                local_file_size = os.path.getsize(file_path)
             if 'Content-Length' in response.headers:
                 server_file_size = int(response.headers['Content-Length'])
                 
@@ -282,6 +529,85 @@ class JFrogUploader:
             logger.error(f"Validation error: {str(e)}")
             return False
     
+    async def _upload_files_async(self, files, progress_bar=None):
+        """Upload small files concurrently from one event loop sharing a keep-alive connection pool."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        limits = httpx.Limits(max_connections=self.connection_limits, max_keepalive_connections=self.connection_limits)
+        timeout = httpx.Timeout(READ_TIMEOUT, connect=CONNECTION_TIMEOUT)
+        
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout, auth=self.auth) as client:
+            results = await asyncio.gather(
+                *(self._upload_async(client, semaphore, file_path, target_path, progress_bar)
+                  for file_path, target_path, _ in files),
+                return_exceptions=True
+            )
+        
+        for (file_path, target_path, _), result in zip(files, results):
+            if isinstance(result, Exception):
+                logger.error(f"Exception during upload of {file_path}: {str(result)}")
+            elif result:
+                logger.info(f"Successfully uploaded {file_path} to {target_path}")
+            else:
+                logger.error(f"Failed to upload {file_path} to {target_path}")
+    
+    async def _upload_async(self, client, semaphore, file_path, target_path, progress_bar=None):
+        """Upload a single small file with the shared async client."""
+        async with semaphore:
+            url = self._build_url(target_path)
+            data = await asyncio.to_thread(Path(file_path).read_bytes)
+            tracker = UploadTracker(file_path, len(data), progress_bar)
+            
+            headers = {
+                'Content-Type': 'application/octet-stream',
+                'X-Checksum-Md5': hashlib.md5(data).hexdigest()
+            }
+            
+            for retry in range(MAX_RETRIES):
+                try:
+                    response = await client.put(url, content=data, headers=headers)
+                    if response.status_code in (200, 201):
+                        tracker.update(len(data))
+                        tracker.close()
+                        logger.info(f"Upload successful for {file_path}")
+                        
+                        # Validate the uploaded file exists and has correct size
+                        response = await client.head(url)
+                        if response.status_code != 200:
+                            logger.error(f"Validation failed: Could not retrieve file info. Status: {response.status_code}")
+                            return False
+                        if 'Content-Length' in response.headers and int(response.headers['Content-Length']) != len(data):
+                            logger.warning(f"File size mismatch - Local: {len(data)}, Server: {response.headers['Content-Length']}")
+                            return False
+                        return True
+                    
+                    logger.warning(
+                        f"Upload failed, retry {retry + 1}/{MAX_RETRIES}. "
+                        f"Status: {response.status_code}, Response: {response.text}"
+                    )
+                    if "checksum" in response.text.lower():
+                        logger.warning(f"Checksum error detected! Adding X-Checksum-Deploy header")
+                        headers['X-Checksum-Deploy'] = 'true'
+                except httpx.HTTPError as e:
+                    logger.warning(f"Upload exception, retry {retry + 1}/{MAX_RETRIES}: {str(e)}")
+                
+                backoff_time = RETRY_BACKOFF_FACTOR * (2 ** retry)
+                logger.info(f"Waiting {backoff_time}s before retry...")
+                await asyncio.sleep(backoff_time)
+            
+            tracker.close()
+            logger.error(f"Failed to upload {file_path} after {MAX_RETRIES} retries")
+            return False
+    
+    def _scan_directory(self, directory, rel_prefix=''):
+        """Recursively yield (DirEntry, relative path) for every file under directory."""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = f"{rel_prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._scan_directory(entry.path, f"{rel_path}/")
+                elif entry.is_file():
+                    yield entry, rel_path
+    
     def upload_directory(self, directory_path, target_prefix=None):
         """Upload all files in a directory with parallel processing."""
         directory_path = Path(directory_path)
@@ -289,17 +615,14 @@ class JFrogUploader:
             logger.error(f"Directory not found: {directory_path}")
             return False
         
-        # Collect all files
+        # Collect all files in a single scandir pass, caching each file's size
         files = []
-        for item in directory_path.glob('**/*'):
-            if item.is_file():
-                # Calculate relative path
-                rel_path = item.relative_to(directory_path)
-                if target_prefix:
-                    target_path = f"{target_prefix}/{rel_path}"
-                else:
-                    target_path = str(rel_path)
-                files.append((str(item), target_path))
+        for entry, rel_path in self._scan_directory(str(directory_path)):
+            if target_prefix:
+                target_path = f"{target_prefix}/{rel_path}"
+            else:
+                target_path = rel_path
+            files.append((entry.path, target_path, entry.stat().st_size))
         
         total_files = len(files)
         if total_files == 0:
@@ -309,33 +632,38 @@ class JFrogUploader:
         logger.info(f"Found {total_files} files to upload")
         
         # Sort files by size (smallest first)
-        files.sort(key=lambda x: os.path.getsize(x[0]))
-        
-        # Calculate total size
-        total_size = sum(os.path.getsize(file_path) for file_path, _ in files)
-        logger.info(f"Total upload size: {total_size/1024/1024:.2f} MB")
+        files.sort(key=itemgetter(2))
         
-        # Separate files by size
+        # Calculate total size and separate files by size in one pass over the cached sizes
+        total_size = 0
         large_files = []
         normal_files = []
         
-        for file_path, target_path in files:
-            file_size = os.path.getsize(file_path)
+        for file_path, target_path, file_size in files:
+            total_size += file_size
             if file_size >= self.large_threshold:
-                large_files.append((file_path, target_path))
+                large_files.append((file_path, target_path, file_size))
             else:
-                normal_files.append((file_path, target_path))
+                normal_files.append((file_path, target_path, file_size))
         
+        logger.info(f"Total upload size: {total_size/1024/1024:.2f} MB")
         logger.info(f"Files categorized by size threshold of {self.large_threshold/1024/1024:.2f} MB: {len(normal_files)} normal, {len(large_files)} large")
         
+        # One aggregate progress bar shared by every upload
+        progress_bar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Uploading")
+        
         # Process normal files in parallel
-        if normal_files:
+        if normal_files and HTTPX_AVAILABLE:
+            logger.info(f"Processing {len(normal_files)} normal files asynchronously with concurrency {self.max_workers}"
+                        f"{' over HTTP/2' if HTTP2_AVAILABLE else ''}")
+            asyncio.run(self._upload_files_async(normal_files, progress_bar))
+        elif normal_files:
             logger.info(f"Processing {len(normal_files)} normal files with concurrency {self.max_workers}")
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 # Submit all upload tasks
                 future_to_file = {
-                    executor.submit(self.upload_file, file_path, target_path): (file_path, target_path)
-                    for file_path, target_path in normal_files
+                    executor.submit(self.upload_file, file_path, target_path, progress_bar, file_size): (file_path, target_path)
+                    for file_path, target_path, file_size in normal_files
                 }
                 
                 # Process results as they complete
@@ -350,17 +678,27 @@ class JFrogUploader:
                     except Exception as e:
                         logger.error(f"Exception during upload of {file_path}: {str(e)}")
         
-        # Process large files one at a time
+        # Process large files on their own pool, one stream per file
         if large_files:
-            logger.info(f"Processing {len(large_files)} large files one at a time")
-            for file_path, target_path in large_files:
-                logger.info(f"Processing large file: {file_path}")
-                success = self.upload_file(file_path, target_path)
-                if success:
-                    logger.info(f"Successfully uploaded large file {file_path} to {target_path}")
-                else:
-                    logger.error(f"Failed to upload large file {file_path} to {target_path}")
+            logger.info(f"Processing {len(large_files)} large files with concurrency {self.large_workers}")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.large_workers) as executor:
+                future_to_file = {
+                    executor.submit(self.upload_file, file_path, target_path, progress_bar, file_size): (file_path, target_path)
+                    for file_path, target_path, file_size in large_files
+                }
+                
+                for future in concurrent.futures.as_completed(future_to_file):
+                    file_path, target_path = future_to_file[future]
+                    try:
+                        success = future.result()
+                        if success:
+                            logger.info(f"Successfully uploaded large file {file_path} to {target_path}")
+                        else:
+                            logger.error(f"Failed to upload large file {file_path} to {target_path}")
+                    except Exception as e:
+                        logger.error(f"Exception during upload of large file {file_path}: {str(e)}")
         
+        progress_bar.close()
         logger.info(f"Upload process completed")
         return True
 
@@ -376,8 +714,12 @@ def parse_arguments():
     parser.add_argument('--target', help='Target path in the repository')
     parser.add_argument('--parallel', type=int, default=DEFAULT_CONCURRENT_UPLOADS, 
                         help=f'Number of concurrent uploads (default: {DEFAULT_CONCURRENT_UPLOADS})')
+    parser.add_argument('--large-parallel', type=int, default=DEFAULT_LARGE_CONCURRENT_UPLOADS,
+                        help=f'Number of large files uploaded concurrently (default: {DEFAULT_LARGE_CONCURRENT_UPLOADS})')
     parser.add_argument('--large-threshold', type=float, default=DEFAULT_LARGE_FILE_THRESHOLD/(1024*1024),
-                        help=f'Size threshold in MB for large files to process sequentially (default: {DEFAULT_LARGE_FILE_THRESHOLD/(1024*1024):.0f})')
+                        help=f'Size threshold in MB for large files to upload on the large-file pool (default: {DEFAULT_LARGE_FILE_THRESHOLD/(1024*1024):.0f})')
+    parser.add_argument('--connection-limit', type=int, default=None,
+                        help='Maximum pooled HTTP connections (default: largest of --parallel and --large-parallel)')
     parser.add_argument('--chunk-size', type=int, default=None,
                         help='Chunk size in KB for streaming uploads (default: auto-calculated based on system memory)')
     
@@ -398,7 +740,7 @@ def main():
     logger.info(f"JFrog Upload started")
     logger.info(f"Uploading from {args.source} to {args.repo}/{args.target if args.target else ''}")
     logger.info(f"Using {args.parallel} concurrent uploads")
-    logger.info(f"Files larger than {args.large_threshold:.2f} MB will be processed sequentially")
+    logger.info(f"Files larger than {args.large_threshold:.2f} MB will be uploaded {args.large_parallel} at a time")
     
     uploader = JFrogUploader(
         base_url=args.url,
@@ -407,7 +749,9 @@ def main():
         api_key=args.apikey,
         max_workers=args.parallel,
         large_threshold=large_threshold_bytes,
-        chunk_size=chunk_size_bytes
+        chunk_size=chunk_size_bytes,
+        large_workers=args.large_parallel,
+        connection_limits=args.connection_limit
     )
     
     logger.info(f"Using chunk size of {uploader.chunk_size / (1024 * 1024):.2f} MB for streaming uploads")
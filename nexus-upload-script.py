@@ -9,6 +9,13 @@ This script:
 """
 
 import os
+import io
+import errno
+import queue
+import base64
+import http.client
+import urllib.parse
+import shutil
 import zipfile
 import requests
 import argparse
@@ -18,6 +25,11 @@ from pathlib import Path
 from os import environ
 
 import time
+import contextlib
+import threading
+import collections
+import concurrent.futures
+import multiprocessing
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
@@ -28,6 +40,34 @@ try:
 except ImportError:
     TQDM_AVAILABLE = False
 
+# Use a SIMD-accelerated DEFLATE implementation for zipfile when one is installed.
+# Both produce standard DEFLATE streams, so the archive format is unchanged.
+try:
+    from zlib_ng import zlib_ng
+    zipfile.zlib = zlib_ng
+    FAST_DEFLATE = "zlib-ng"
+except ImportError:
+    try:
+        from isal import isal_zlib
+        zipfile.zlib = isal_zlib
+        FAST_DEFLATE = "isal"
+    except ImportError:
+        FAST_DEFLATE = None
+
+# zipfile checksums every member with a module-level crc32 (binascii's table-driven
+# version). isal and zlib-ng use carry-less multiply folding, several times faster.
+try:
+    from isal import isal_zlib as _crc_module
+    zipfile.crc32 = _crc_module.crc32
+    FAST_CRC32 = "isal"
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as _crc_module
+        zipfile.crc32 = _crc_module.crc32
+        FAST_CRC32 = "zlib-ng"
+    except ImportError:
+        FAST_CRC32 = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,7 +79,308 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nexus_uploader")
 
-def create_zip_archive(source_dir, output_path=None, chunk_size=8192, max_memory_mb=100):
+# Directory scanning threads (scans are latency-bound, so more threads than cores)
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Parallel compression: files up to this size are compressed in worker processes
+DEFAULT_COMPRESS_WORKERS = os.cpu_count() or 1
+PARALLEL_COMPRESS_MAX_SIZE = 64 * 1024 * 1024
+PARALLEL_COMPRESS_READ_SIZE = 1024 * 1024
+
+# Already-compressed formats are stored as-is; deflating them costs CPU and saves almost nothing
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.tgz', '.xz', '.zst', '.bz2', '.br', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp3', '.mp4', '.mkv', '.webm',
+    '.jar', '.war', '.whl', '.nupkg',
+})
+
+# DEFLATE level used when uploading: level 1 is several times faster than zlib's default 6
+# and usually only a few percent larger, which the network more than pays back
+DEFAULT_UPLOAD_COMPRESS_LEVEL = 1
+
+# Split uploads (--parallel-parts): size of each part and attempts per part
+DEFAULT_UPLOAD_PART_SIZE = 256 * 1024 * 1024
+PART_UPLOAD_ATTEMPTS = 3
+
+# Chunks buffered between the zip writer and the uploader when streaming (--stream)
+STREAM_QUEUE_CHUNKS = 8
+
+# Trees at or below these limits are zipped in memory and uploaded without a local ZIP file
+SMALL_TREE_MAX_SIZE = 16 * 1024 * 1024
+SMALL_TREE_MAX_FILES = 1000
+
+# The output ZIP's disk space is reserved in steps of this size as it grows
+ZIP_PREALLOCATE_STEP = 256 * 1024 * 1024
+
+# Buffer used when copying >1GB files into the archive, and how often to log progress
+LARGE_FILE_COPY_BUFFER = 8 * 1024 * 1024
+LARGE_FILE_LOG_INTERVAL = 100 * 1024 * 1024
+
+class ProgressReader:
+    """
+    Read-only file wrapper that logs progress while a large file is copied.
+    
+    Supports both read() and readinto(); this only counts bytes and logs roughly
+    every LARGE_FILE_LOG_INTERVAL bytes.
+    """
+    
+    def __init__(self, source, total_size):
+        self.source = source
+        self.total_size = total_size
+        self.bytes_processed = 0
+        self.next_log = LARGE_FILE_LOG_INTERVAL
+    
+    def read(self, size=-1):
+        chunk = self.source.read(size)
+        self._advance(len(chunk))
+        return chunk
+    
+    def readinto(self, buffer):
+        count = self.source.readinto(buffer)
+        self._advance(count or 0)
+        return count
+    
+    def _advance(self, count):
+        self.bytes_processed += count
+        
+        # Log progress for very large files (threshold compare instead of a modulo per chunk)
+        if self.bytes_processed >= self.next_log:
+            logger.info(f"  Progress: {self.bytes_processed/(1024*1024):.1f} MB / {self.total_size/(1024*1024):.1f} MB ({self.bytes_processed/self.total_size*100:.1f}%)")
+            self.next_log = self.bytes_processed + LARGE_FILE_LOG_INTERVAL
+
+class PreallocatingFile(io.FileIO):
+    """
+    Output file that reserves disk space ahead of the write position.
+    
+    Space is allocated with posix_fallocate in ZIP_PREALLOCATE_STEP steps, which
+    keeps a multi-GB archive in few extents and reports a full disk up front
+    rather than partway through a block. The unused tail is truncated on close.
+    """
+    
+    def __init__(self, path, step=ZIP_PREALLOCATE_STEP):
+        super().__init__(path, 'w')
+        self.step = step
+        self.allocated = 0
+        self.end = 0
+    
+    def write(self, data):
+        position = self.tell()
+        needed = position + len(data)
+        if needed > self.allocated and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(self.fileno(), self.allocated, needed + self.step - self.allocated)
+                self.allocated = needed + self.step
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise
+                # Filesystem doesn't support it; stop trying
+                self.allocated = float('inf')
+        written = super().write(data)
+        self.end = max(self.end, position + written)
+        return written
+    
+    def close(self):
+        if not self.closed and self.allocated:
+            self.truncate(self.end)
+        super().close()
+
+def open_zip_output(output_path):
+    """
+    Return a context manager giving the binary file the ZIP archive is written to.
+    
+    Args:
+        output_path (str or file object): Output path, or an already open file object
+    
+    Returns:
+        Context manager yielding a writable binary file
+    """
+    if not isinstance(output_path, str):
+        return contextlib.nullcontext(output_path)
+    return io.BufferedWriter(PreallocatingFile(output_path), buffer_size=1024 * 1024)
+
+def scan_directory(directory, rel_prefix=""):
+    """
+    List one directory level using os.scandir.
+    
+    DirEntry answers is_dir/is_file from the directory listing and caches stat(),
+    so each file costs at most one stat call. The stat result is handed on so the
+    zip step can build its ZipInfo without calling stat() again.
+    
+    Args:
+        directory (str): Directory to list
+        rel_prefix (str): Relative path of the directory, including a trailing slash
+    
+    Returns:
+        tuple: (list of (absolute path, relative path, os.stat_result) for files,
+                list of (absolute path, relative prefix) for subdirectories)
+    """
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            rel_path = f"{rel_prefix}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, f"{rel_path}/"))
+            elif entry.is_file():
+                files.append((entry.path, rel_path, entry.stat()))
+    return files, subdirs
+
+def walk_files(directory, max_workers=DEFAULT_SCAN_WORKERS):
+    """
+    Recursively yield every file under a directory, scanning directories in parallel.
+    
+    Each directory is listed by a worker thread and its subdirectories are submitted
+    back to the pool, so several stat calls are in flight at once. This matters most
+    on network filesystems where every call waits on a round trip. The pool size
+    also caps the number of directory handles open at the same time.
+    
+    Args:
+        directory (str): Directory to walk
+        max_workers (int): Number of scanning threads
+    
+    Yields:
+        tuple: (absolute path, path relative to the top directory, os.stat_result)
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(scan_directory, directory)}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for subdir, rel_prefix in subdirs:
+                    pending.add(executor.submit(scan_directory, subdir, rel_prefix))
+                yield from files
+
+def probe_small_tree(source_dir, max_size=SMALL_TREE_MAX_SIZE, max_files=SMALL_TREE_MAX_FILES):
+    """
+    Check whether a directory is small enough to zip in memory.
+    
+    The walk stops as soon as either limit is exceeded, so large trees cost only a
+    partial scan.
+    
+    Args:
+        source_dir (str): Directory to check
+        max_size (int): Largest total file size considered small (bytes)
+        max_files (int): Largest file count considered small
+    
+    Returns:
+        list: (absolute path, relative path, os.stat_result) for every file, or None
+              if the tree is over either limit (or isn't a directory)
+    """
+    if not os.path.isdir(source_dir):
+        return None
+    
+    files = []
+    total_size = 0
+    for entry in walk_files(source_dir):
+        files.append(entry)
+        total_size += entry[2].st_size
+        if total_size > max_size or len(files) > max_files:
+            return None
+    return files
+
+def zip_info_from_stat(arcname, file_stat, compress_type=zipfile.ZIP_DEFLATED, compress_level=None):
+    """
+    Build a ZipInfo from a stat result already gathered by the scan.
+    
+    Equivalent to zipfile.ZipInfo.from_file, without the extra stat() call.
+    
+    Args:
+        arcname (str): Name inside the archive
+        file_stat (os.stat_result): Stat result of the source file
+        compress_type (int): zipfile compression constant
+        compress_level (int, optional): DEFLATE level (None for the engine's default)
+    
+    Returns:
+        zipfile.ZipInfo: Entry with timestamp, permissions and size filled in
+    """
+    date_time = time.localtime(file_stat.st_mtime)[0:6]
+    if date_time[0] < 1980:
+        # ZIP timestamps can't represent dates before 1980
+        date_time = (1980, 1, 1, 0, 0, 0)
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.external_attr = (file_stat.st_mode & 0xFFFF) << 16
+    zinfo.file_size = file_stat.st_size
+    zinfo.compress_type = compress_type
+    zinfo._compresslevel = compress_level  # What ZipFile.write sets from ZipFile.compresslevel
+    return zinfo
+
+def engine_compress_level(compress_level):
+    """
+    Map a zlib-style DEFLATE level onto the active DEFLATE engine's range.
+    
+    isal only has levels 0-3, so 1-9 are scaled down (zlib's default 6 becomes
+    isal's default 2); zlib and zlib-ng take 1-9 as-is.
+    
+    Args:
+        compress_level (int, optional): DEFLATE level 1-9 (None for the engine's default)
+    
+    Returns:
+        int: Level to pass to zipfile and compressobj (None stays None)
+    """
+    if compress_level is None or FAST_DEFLATE != "isal":
+        return compress_level
+    return min(3, max(0, (compress_level - 1) // 2))
+
+def deflate_file(file_path, compress_level=None):
+    """
+    Compress a file into a raw DEFLATE stream (runs in a worker process).
+    
+    Args:
+        file_path (str): File to compress
+        compress_level (int, optional): DEFLATE level (None for the engine's default)
+    
+    Returns:
+        tuple: (compressed bytes, CRC32 of the original data, original size)
+    """
+    if compress_level is None:
+        compress_level = zipfile.zlib.Z_DEFAULT_COMPRESSION
+    compressor = zipfile.zlib.compressobj(compress_level, zipfile.zlib.DEFLATED, -15)
+    crc = 0
+    file_size = 0
+    parts = []
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(PARALLEL_COMPRESS_READ_SIZE)
+            if not chunk:
+                break
+            crc = zipfile.crc32(chunk, crc)
+            file_size += len(chunk)
+            parts.append(compressor.compress(chunk))
+    parts.append(compressor.flush())
+    return b"".join(parts), crc, file_size
+
+def write_deflated_member(zipf, arcname, file_stat, compressed, crc, file_size):
+    """
+    Append an already DEFLATE-compressed file to an open ZipFile.
+    
+    zipfile has no public API for pre-compressed data, so this writes the local
+    header and data itself and registers the entry for the central directory,
+    the same way ZipFile.writestr does internally.
+    
+    Args:
+        zipf (zipfile.ZipFile): Archive open for writing
+        arcname (str): Name inside the archive
+        file_stat (os.stat_result): Stat result of the source file (timestamp and permissions)
+        compressed (bytes): Raw DEFLATE stream from deflate_file()
+        crc (int): CRC32 of the uncompressed data
+        file_size (int): Uncompressed size
+    """
+    zinfo = zip_info_from_stat(arcname, file_stat, compress_level=zipf.compresslevel)
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(compressed)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+def create_zip_archive(source_dir, output_path=None, chunk_size=8192, max_memory_mb=100,
+                       compress_workers=DEFAULT_COMPRESS_WORKERS, compress_level=None):
     """
     Create a ZIP archive of all files in the source directory using memory-efficient streaming.
     
@@ -47,13 +388,22 @@ def create_zip_archive(source_dir, output_path=None, chunk_size=8192, max_memory
         source_dir (str): Directory containing files to zip
         output_path (str, optional): Path for the output ZIP file. 
                                     If None, uses timestamp-based name in current directory.
+                                    A writable binary file object (such as a pipe) may be
+                                    passed instead to stream the archive.
         chunk_size (int): Size of chunks to read when processing files (bytes)
-        max_memory_mb (int): Maximum memory allocation for file collection (MB)
+        max_memory_mb (int): Kept for compatibility; files are streamed into the
+                             archive so no file list is held in memory
+        compress_workers (int): Worker processes compressing files up to 64MB in
+                                parallel (1 compresses everything in this process)
+        compress_level (int, optional): DEFLATE level 1-9 (None for the engine's default,
+                                        6 with zlib); scaled to 0-3 under isal
     
     Returns:
-        str: Path to the created ZIP file
+        str: Path to the created ZIP file (or the file object that was passed in)
     """
     source_path = Path(source_dir)
+    # Mapped once here; zipfile, the workers and the ZipInfo entries all use this value
+    compress_level = engine_compress_level(compress_level)
     
     # Generate ZIP filename based on timestamp if not provided
     if not output_path:
@@ -64,104 +414,586 @@ def create_zip_archive(source_dir, output_path=None, chunk_size=8192, max_memory
     if not source_path.exists() or not source_path.is_dir():
         raise ValueError(f"Source directory does not exist: {source_dir}")
     
-    # Validate the directory has files without loading everything into memory
+    # Files are zipped as the scan finds them, so no file list is held in memory
     file_count = 0
     total_size = 0
     largest_file = {"path": None, "size": 0}
+    logger.info(f"Scanning and compressing directory {source_dir}...")
     
-    # Process files in smaller batches to avoid memory issues
-    batch_size = int((max_memory_mb * 1024 * 1024) / 1000)  # Approximate memory for path objects
-    logger.info(f"Scanning directory {source_dir} in batches...")
-    
-    for i, file_path in enumerate(source_path.glob("**/*")):
-        if not file_path.is_file():
-            continue
-            
-        file_count += 1
-        file_size = file_path.stat().st_size
-        total_size += file_size
+    # Create the ZIP file using streaming to minimize memory usage with ZIP64 support explicitly enabled
+    with open_zip_output(output_path) as zip_sink, \
+            zipfile.ZipFile(zip_sink, 'w', zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=compress_level) as zipf:
+        # Setup progress bar if tqdm is available (the file count isn't known up front)
+        if TQDM_AVAILABLE:
+            pbar = tqdm(total=None, unit='file', desc="Creating ZIP")
+        
+        # zlib work is serialized inside one process, so smaller files are compressed by a
+        # process pool and their results written in submission order. The number of
+        # results waiting to be written is capped to bound memory. Workers are started from a
+        # forkserver rather than forked, since the scan threads (and with --stream the upload
+        # thread) are already running and a forked child could inherit a held lock.
+        pool = None
+        if compress_workers > 1:
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            pool = concurrent.futures.ProcessPoolExecutor(compress_workers,
+                                                          mp_context=multiprocessing.get_context(start_method))
+        in_flight = collections.deque()
+        
+        def write_completed(limit):
+            while len(in_flight) > limit:
+                future, arcname, file_stat = in_flight.popleft()
+                try:
+                    write_deflated_member(zipf, arcname, file_stat, *future.result())
+                except Exception as e:
+                    logger.error(f"Error adding file {arcname}: {str(e)}")
+                    raise
+                if TQDM_AVAILABLE:
+                    pbar.update(1)
         
-        # Track largest file for memory estimation
-        if file_size > largest_file["size"]:
-            largest_file = {"path": file_path, "size": file_size}
+        try:
+            for file_path, arcname, file_stat in walk_files(source_dir):
+                # Size comes from the scan's stat; no further stat calls are made per file
+                file_size = file_stat.st_size
+                file_count += 1
+                total_size += file_size
+                
+                # Track largest file for the summary
+                if file_size > largest_file["size"]:
+                    largest_file = {"path": arcname, "size": file_size}
+                
+                # Store already-compressed files instead of deflating them again
+                if os.path.splitext(arcname)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+                    compress_type = zipfile.ZIP_STORED
+                else:
+                    compress_type = zipfile.ZIP_DEFLATED
+                
+                if pool is not None and compress_type == zipfile.ZIP_DEFLATED and file_size <= PARALLEL_COMPRESS_MAX_SIZE:
+                    in_flight.append((pool.submit(deflate_file, file_path, compress_level), arcname, file_stat))
+                    write_completed(compress_workers * 4)
+                    continue
+                
+                try:
+                    # Improved handling for large files - use chunked approach
+                    if file_size > 1 * 1024 * 1024 * 1024:  # If file is larger than 1GB
+                        logger.info(f"Processing large file with chunked approach: {arcname} ({file_size/(1024*1024*1024):.2f} GB)")
+                        
+                        # Create a ZipInfo object with explicit ZIP64 support
+                        zi = zip_info_from_stat(arcname, file_stat, compress_type, compress_level)  # file_size set to ensure ZIP64 headers
+                        
+                        # Use a large buffer so the copy loop makes few read/write calls
+                        large_chunk_size = max(chunk_size * 16, LARGE_FILE_COPY_BUFFER)
+                        
+                        # Open the file for writing to the ZIP with the ZipInfo object
+                        with zipf.open(zi, 'w', force_zip64=True) as dest:
+                            with open(file_path, 'rb', buffering=0) as source:
+                                # Copy in chunks through one reused buffer, so no bytes object is allocated per chunk
+                                reader = ProgressReader(source, file_size)
+                                buffer = bytearray(large_chunk_size)
+                                view = memoryview(buffer)
+                                while True:
+                                    count = reader.readinto(buffer)
+                                    if not count:
+                                        break
+                                    dest.write(view[:count])
+                    else:
+                        # For smaller files, stream the file in as ZipFile.write does, reusing the scan's stat
+                        zi = zip_info_from_stat(arcname, file_stat, compress_type, compress_level)
+                        with open(file_path, 'rb') as source, zipf.open(zi, 'w') as dest:
+                            shutil.copyfileobj(source, dest, chunk_size)
+                
+                except Exception as e:
+                    logger.error(f"Error adding file {arcname}: {str(e)}")
+                    raise
+                
+                # Update progress bar
+                if TQDM_AVAILABLE:
+                    pbar.update(1)
             
-        # Log progress in batches
-        if file_count % 1000 == 0:
-            logger.info(f"Scanned {file_count} files so far...")
+            write_completed(0)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        # Close progress bar
+        if TQDM_AVAILABLE:
+            pbar.close()
     
     if file_count == 0:
+        if isinstance(output_path, str):
+            os.remove(output_path)
         raise ValueError(f"No files found in source directory: {source_dir}")
     
-    # Log summary before zipping
+    # Log summary
     total_size_mb = total_size / (1024 * 1024)
     largest_file_mb = largest_file["size"] / (1024 * 1024)
-    logger.info(f"Found {file_count} files ({total_size_mb:.2f} MB total) to compress")
-    logger.info(f"Largest file is {largest_file_mb:.2f} MB: {largest_file['path'].relative_to(source_path)}")
+    logger.info(f"Compressed {file_count} files ({total_size_mb:.2f} MB total)")
+    logger.info(f"Largest file is {largest_file_mb:.2f} MB: {largest_file['path']}")
     
-    # Create the ZIP file using streaming to minimize memory usage with ZIP64 support explicitly enabled
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
-        # Create a file list for tracking progress
-        files_list = [f for f in source_path.glob("**/*") if f.is_file()]
+    if not isinstance(output_path, str):
+        logger.info("Finished writing ZIP archive to stream")
+        return output_path
+    
+    zip_size = Path(output_path).stat().st_size / (1024 * 1024)  # Size in MB
+    compression_ratio = 0 if total_size == 0 else (1 - (zip_size * 1024 * 1024) / total_size) * 100
+    logger.info(f"Created ZIP archive: {output_path} ({zip_size:.2f} MB, {compression_ratio:.1f}% compression)")
+    
+    return output_path
+
+class UploadReader:
+    """
+    File wrapper passed to requests as the upload body.
+    
+    Because it has a length, requests sends a Content-Length header and writes the
+    file in chunk_size blocks instead of using chunked transfer encoding. Progress
+    is reported to a tqdm bar when one is given, otherwise logged every 5%.
+    """
+    
+    def __init__(self, file_data, file_size, chunk_size, pbar=None):
+        self.file_data = file_data
+        self.file_size = file_size
+        self.chunk_size = chunk_size
+        self.pbar = pbar
+        self.bytes_read = 0
+        self.next_report = 50 * chunk_size
+        self.next_percent = 5
+        self.start_time = time.time()
+    
+    def __len__(self):
+        return self.file_size
+    
+    def read(self, size=-1):
+        # Read whole chunks regardless of the caller's (small) block size so each socket write is large
+        chunk = self.file_data.read(max(size, self.chunk_size))
+        if not chunk:
+            return chunk
         
-        # Setup progress bar if tqdm is available
-        if TQDM_AVAILABLE:
-            pbar = tqdm(total=len(files_list), unit='file', desc="Creating ZIP")
+        self.bytes_read += len(chunk)
+        bytes_read = self.bytes_read
+        file_size = self.file_size
         
-        for file_path in files_list:
-            # Use relative path inside the ZIP file
-            arcname = file_path.relative_to(source_path)
-            file_size = file_path.stat().st_size
-            
-            try:
-                # Improved handling for large files - use chunked approach
-                if file_size > 1 * 1024 * 1024 * 1024:  # If file is larger than 1GB
-                    logger.info(f"Processing large file with chunked approach: {arcname} ({file_size/(1024*1024*1024):.2f} GB)")
-                    
-                    # Create a ZipInfo object with explicit ZIP64 support
-                    zi = zipfile.ZipInfo(str(arcname))
-                    zi.compress_type = zipfile.ZIP_DEFLATED
-                    zi.file_size = file_size  # Set size to ensure ZIP64 headers
-                    
-                    # Use larger chunk size for better performance with large files
-                    large_chunk_size = chunk_size * 16  # Adjust based on available memory
-                    
-                    # Open the file for writing to the ZIP with the ZipInfo object
-                    with zipf.open(zi, 'w', force_zip64=True) as dest:
-                        with open(file_path, 'rb') as source:
-                            # Copy in chunks to avoid memory issues
-                            bytes_processed = 0
-                            while True:
-                                chunk = source.read(large_chunk_size)
-                                if not chunk:
-                                    break
-                                dest.write(chunk)
-                                bytes_processed += len(chunk)
-                                
-                                # Log progress for very large files
-                                if bytes_processed % (100 * 1024 * 1024) < large_chunk_size:  # Log every ~100MB
-                                    logger.info(f"  Progress: {bytes_processed/(1024*1024):.1f} MB / {file_size/(1024*1024):.1f} MB ({bytes_processed/file_size*100:.1f}%)")
-                else:
-                    # For smaller files, use writestr
-                    with open(file_path, 'rb') as f:
-                        zipf.writestr(str(arcname), f.read(), compress_type=zipfile.ZIP_DEFLATED)
+        if self.pbar is not None:
+            self.pbar.update(len(chunk))
             
-            except Exception as e:
-                logger.error(f"Error adding file {arcname}: {str(e)}")
-                raise
+            # Log additional progress info periodically
+            if bytes_read >= self.next_report:
+                elapsed = time.time() - self.start_time
+                speed_mb = (bytes_read / elapsed) / (1024 * 1024) if elapsed > 0 else 0
+                logger.info(f"Upload in progress: {bytes_read/(1024*1024):.2f} MB sent at {speed_mb:.2f} MB/s")
+                self.next_report += 50 * self.chunk_size
+        elif bytes_read * 100 >= self.next_percent * file_size:
+            # Log progress every 5%; the clock is only read when a line is logged
+            progress = int((bytes_read / file_size) * 100)
+            elapsed = time.time() - self.start_time
+            speed = bytes_read / elapsed if elapsed > 0 else 0
+            speed_mb = speed / (1024 * 1024)
+            eta_seconds = (file_size - bytes_read) / speed if speed > 0 else 0
+            eta_minutes = eta_seconds / 60
             
-            # Update progress bar
+            logger.info(
+                f"Upload progress: {progress}% ({bytes_read/(1024*1024):.2f} MB / {file_size/(1024*1024):.2f} MB) "
+                f"- Speed: {speed_mb:.2f} MB/s - ETA: {eta_minutes:.1f} minutes"
+            )
+            self.next_percent = progress - progress % 5 + 5
+        
+        return chunk
+
+def upload_with_sendfile(zip_file, upload_url, username, password, file_size, headers, timeout,
+                         chunk_size=1024*1024, pbar=None):
+    """
+    PUT a file over plain HTTP using sendfile(2).
+    
+    The body goes from the page cache straight to the socket, so the payload is
+    never copied through Python. Only usable for http:// URLs.
+    
+    Args:
+        zip_file (str): Path to the file to upload
+        upload_url (str): Full http:// upload URL
+        username (str): Nexus username
+        password (str): Nexus password
+        file_size (int): Size of the file in bytes
+        headers (dict): Extra request headers
+        timeout (tuple): (connect timeout, read timeout) in seconds
+        chunk_size (int): Maximum bytes handed to each sendfile call
+        pbar (tqdm, optional): Progress bar to update
+    
+    Returns:
+        tuple: (HTTP status code, response body text)
+    """
+    parts = urllib.parse.urlsplit(upload_url)
+    credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+    path = requests.utils.requote_uri(parts.path or '/')
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout[0])
+    try:
+        conn.connect()
+        conn.sock.settimeout(timeout[1])
+        conn.putrequest('PUT', path)
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.putheader('Content-Length', str(file_size))
+        conn.putheader('Authorization', f"Basic {credentials}")
+        conn.endheaders()
+        
+        start_time = time.time()
+        last_progress = 0
+        with open(zip_file, 'rb') as f:
+            offset = 0
+            while offset < file_size:
+                sent = conn.sock.sendfile(f, offset, min(chunk_size, file_size - offset))
+                if sent == 0:
+                    raise ConnectionError(f"Connection closed after {offset} of {file_size} bytes")
+                offset += sent
+                
+                if pbar is not None:
+                    pbar.update(sent)
+                else:
+                    # Log progress every 5%
+                    progress = int((offset / file_size) * 100)
+                    if progress >= last_progress + 5:
+                        elapsed = time.time() - start_time
+                        speed_mb = (offset / elapsed) / (1024 * 1024) if elapsed > 0 else 0
+                        logger.info(f"Upload progress: {progress}% ({offset/(1024*1024):.2f} MB) - Speed: {speed_mb:.2f} MB/s")
+                        last_progress = progress
+        
+        response = conn.getresponse()
+        return response.status, response.read().decode(errors='replace')
+    finally:
+        conn.close()
+
+def build_upload_url(nexus_url, repository, filename, directory=None):
+    """
+    Build the URL a file is PUT to in a Nexus raw repository.
+    
+    Args:
+        nexus_url (str): Base URL of the Nexus repository
+        repository (str): Name of the repository
+        filename (str): Name of the uploaded file
+        directory (str, optional): Target directory in Nexus repository
+    
+    Returns:
+        str: Upload URL
+    """
+    upload_url = f"{nexus_url.rstrip('/')}/repository/{repository}"
+    
+    # Add directory to path if specified
+    if directory:
+        upload_url = f"{upload_url}/{directory.strip('/')}"
+    
+    return f"{upload_url}/{filename}"
+
+class QueueStream(io.RawIOBase):
+    """
+    Write-only stream that hands data to a consumer thread through a bounded queue.
+    
+    The zip writer blocks once STREAM_QUEUE_CHUNKS chunks are waiting, so memory use
+    stays bounded and zipping can't run ahead of the upload. If the consumer gives up
+    (abandon()), the next write raises BrokenPipeError so the writer stops early.
+    """
+    
+    def __init__(self, max_chunks=STREAM_QUEUE_CHUNKS):
+        super().__init__()
+        self.chunks = queue.Queue(maxsize=max_chunks)
+        self.abandoned = False
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        if self.abandoned:
+            raise BrokenPipeError("Upload stopped reading the ZIP stream")
+        self.chunks.put(bytes(data))
+        return len(data)
+    
+    def close(self):
+        if not self.closed:
+            super().close()
+            if not self.abandoned:
+                self.chunks.put(None)  # End of stream
+    
+    def __iter__(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            yield chunk
+    
+    def abandon(self):
+        self.abandoned = True
+        # Free space so a writer blocked in put() wakes up and sees the flag
+        try:
+            while True:
+                self.chunks.get_nowait()
+        except queue.Empty:
+            pass
+
+def stream_zip_to_nexus(source_dir, filename, nexus_url, repository, username, password, directory=None,
+                        chunk_size=1024*1024, compress_workers=DEFAULT_COMPRESS_WORKERS,
+                        compress_level=DEFAULT_UPLOAD_COMPRESS_LEVEL):
+    """
+    Zip a directory and upload it at the same time, without a local ZIP file.
+    
+    create_zip_archive writes into a QueueStream from a background thread while the
+    main thread sends its chunks to Nexus with chunked transfer encoding, so wall time
+    is roughly the slower of zipping and uploading rather than their sum.
+    
+    Args:
+        source_dir (str): Directory containing files to zip
+        filename (str): Name of the ZIP file in the repository
+        nexus_url (str): Base URL of the Nexus repository
+        repository (str): Name of the repository
+        username (str): Nexus username
+        password (str): Nexus password
+        directory (str, optional): Target directory in Nexus repository
+        chunk_size (int): Size of the chunks queued and sent (bytes)
+        compress_workers (int): Worker processes used by create_zip_archive
+        compress_level (int, optional): DEFLATE level used by create_zip_archive
+    
+    Returns:
+        bool: True if upload was successful, False otherwise
+    """
+    upload_url = build_upload_url(nexus_url, repository, filename, directory)
+    stream = QueueStream()
+    zip_errors = []
+    
+    def zip_to_stream():
+        try:
+            with io.BufferedWriter(stream, buffer_size=chunk_size) as sink:
+                create_zip_archive(source_dir, sink, chunk_size=chunk_size, compress_workers=compress_workers,
+                                   compress_level=compress_level)
+        except Exception as e:
+            # Closing the writer above has already queued the end-of-stream marker
+            zip_errors.append(e)
+    
+    zip_thread = threading.Thread(target=zip_to_stream, name="zip-writer", daemon=True)
+    
+    if TQDM_AVAILABLE:
+        pbar = tqdm(total=None, unit='B', unit_scale=True, desc="Uploading to Nexus")
+    
+    def zip_chunks():
+        for chunk in stream:
             if TQDM_AVAILABLE:
-                pbar.update(1)
+                pbar.update(len(chunk))
+            yield chunk
+        zip_thread.join()
+        if zip_errors:
+            # Abort the request so Nexus never receives the final chunk of a broken archive
+            raise zip_errors[0]
+    
+    logger.info(f"Streaming ZIP of {source_dir} to {upload_url}")
+    zip_thread.start()
+    try:
+        response = requests.put(
+            upload_url,
+            data=zip_chunks(),
+            auth=(username, password),
+            headers={'Content-Type': 'application/zip', 'Accept': '*/*'},
+            timeout=(30, 1800)
+        )
+    except Exception as e:
+        logger.error(f"Upload error: {str(zip_errors[0] if zip_errors else e)}")
+        return False
+    finally:
+        if TQDM_AVAILABLE:
+            pbar.close()
+        stream.abandon()
+        zip_thread.join()
+    
+    if response.status_code in [200, 201]:
+        logger.info(f"Upload successful! Status code: {response.status_code}")
+        return True
+    else:
+        logger.error(f"Upload failed! Status code: {response.status_code}")
+        logger.error(f"Response: {response.text}")
+        return False
+
+class FileSlice:
+    """
+    Sized, read-only view of a byte range of a file, used as a part upload body.
+    
+    Like UploadReader, the length makes requests send Content-Length; reads are
+    clamped to the slice and counted on the shared progress bar, if any.
+    """
+    
+    def __init__(self, file_data, offset, length, chunk_size, pbar=None):
+        file_data.seek(offset)
+        self.file_data = file_data
+        self.length = length
+        self.remaining = length
+        self.chunk_size = chunk_size
+        self.pbar = pbar
+    
+    def __len__(self):
+        return self.length
+    
+    def read(self, size=-1):
+        chunk = self.file_data.read(min(max(size, self.chunk_size), self.remaining))
+        self.remaining -= len(chunk)
+        if chunk and self.pbar is not None:
+            self.pbar.update(len(chunk))
+        return chunk
+
+def upload_parts_to_nexus(zip_file, nexus_url, repository, username, password, directory=None,
+                          part_size=DEFAULT_UPLOAD_PART_SIZE, max_workers=4, chunk_size=1024*1024):
+    """
+    Upload a ZIP file as numbered parts over several connections at once.
+    
+    A Nexus raw repository stores each PUT as its own component and can't join
+    ranges server-side, so the ZIP is uploaded as <name>.001, <name>.002, ... in
+    parallel. One TCP stream often can't fill a high-latency link, while several
+    can. The parts are plain byte ranges: join them with
+    `cat name.zip.* > name.zip`, or open name.zip.001 directly with 7-Zip.
+    
+    Args:
+        zip_file (str): Path to the ZIP file to upload
+        nexus_url (str): Base URL of the Nexus repository
+        repository (str): Name of the repository
+        username (str): Nexus username
+        password (str): Nexus password
+        directory (str, optional): Target directory in Nexus repository
+        part_size (int): Size of each part (bytes)
+        max_workers (int): Number of parts uploaded at the same time
+        chunk_size (int): Size of socket writes (bytes)
+    
+    Returns:
+        bool: True if every part was uploaded, False otherwise
+    """
+    zip_path = Path(zip_file)
+    file_size = zip_path.stat().st_size
+    part_count = max(1, -(-file_size // part_size))
+    width = max(3, len(str(part_count)))
+    
+    logger.info(f"Uploading {zip_file} ({file_size/(1024*1024):.2f} MB) as {part_count} parts using {max_workers} connections")
+    
+    if TQDM_AVAILABLE:
+        pbar = tqdm(total=file_size, unit='B', unit_scale=True, desc="Uploading to Nexus")
+    
+    sessions = threading.local()
+    
+    def upload_part(index):
+        offset = index * part_size
+        length = min(part_size, file_size - offset)
+        upload_url = build_upload_url(nexus_url, repository, f"{zip_path.name}.{index + 1:0{width}d}", directory)
         
-        # Close progress bar
+        # One connection per worker thread, reused for that thread's parts
+        if not hasattr(sessions, "session"):
+            sessions.session = requests.Session()
+        
+        for attempt in range(1, PART_UPLOAD_ATTEMPTS + 1):
+            try:
+                with open(zip_file, 'rb') as file_data:
+                    body = FileSlice(file_data, offset, length, chunk_size, pbar if TQDM_AVAILABLE else None)
+                    response = sessions.session.put(
+                        upload_url,
+                        data=body,
+                        auth=(username, password),
+                        headers={'Content-Type': 'application/octet-stream', 'Accept': '*/*'},
+                        timeout=(30, 1800)
+                    )
+                if response.status_code in [200, 201]:
+                    logger.info(f"Uploaded part {index + 1}/{part_count} to {upload_url}")
+                    return True
+                logger.warning(f"Part {index + 1} failed (attempt {attempt}/{PART_UPLOAD_ATTEMPTS}), status {response.status_code}: {response.text}")
+                if response.status_code not in [408, 429, 500, 502, 503, 504]:
+                    return False
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Part {index + 1} failed (attempt {attempt}/{PART_UPLOAD_ATTEMPTS}): {str(e)}")
+            
+            if TQDM_AVAILABLE:
+                pbar.update(-(length - body.remaining))  # This part's bytes will be sent again
+            if attempt < PART_UPLOAD_ATTEMPTS:
+                time.sleep(2 ** attempt)
+        return False
+    
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(upload_part, range(part_count)))
+    finally:
         if TQDM_AVAILABLE:
             pbar.close()
     
-    zip_size = Path(output_path).stat().st_size / (1024 * 1024)  # Size in MB
-    compression_ratio = 0 if total_size == 0 else (1 - (zip_size * 1024 * 1024) / total_size) * 100
-    logger.info(f"Created ZIP archive: {output_path} ({zip_size:.2f} MB, {compression_ratio:.1f}% compression)")
+    if all(results):
+        logger.info(f"Upload successful! {part_count} parts uploaded")
+        return True
+    logger.error(f"Upload failed! {results.count(False)} of {part_count} parts could not be uploaded")
+    return False
+
+def check_nexus_access(nexus_url, repository, username, password):
+    """
+    Make a cheap request to the repository to catch bad URLs or credentials early.
     
-    return output_path
+    A raw repository's root may legitimately answer 404, so only connection
+    failures and 401/403 are treated as errors.
+    
+    Args:
+        nexus_url (str): Base URL of the Nexus repository
+        repository (str): Name of the repository
+        username (str): Nexus username
+        password (str): Nexus password
+    
+    Returns:
+        bool: True if Nexus is reachable and accepted the credentials
+    """
+    repository_url = f"{nexus_url.rstrip('/')}/repository/{repository}/"
+    try:
+        response = requests.head(repository_url, auth=(username, password), timeout=(10, 30))
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Cannot reach Nexus at {repository_url}: {str(e)}")
+        return False
+    
+    if response.status_code in [401, 403]:
+        logger.error(f"Nexus rejected the credentials for {repository_url} (status {response.status_code})")
+        return False
+    return True
+
+def upload_bytes_to_nexus(data, filename, nexus_url, repository, username, password, directory=None,
+                          content_type='application/zip'):
+    """
+    Upload an in-memory payload to Nexus repository.
+    
+    Args:
+        data (bytes): Content to upload
+        filename (str): Name of the file in the repository
+        nexus_url (str): Base URL of the Nexus repository
+        repository (str): Name of the repository
+        username (str): Nexus username
+        password (str): Nexus password
+        directory (str, optional): Target directory in Nexus repository
+        content_type (str): Content-Type header for the upload
+    
+    Returns:
+        bool: True if upload was successful, False otherwise
+    """
+    upload_url = build_upload_url(nexus_url, repository, filename, directory)
+    logger.info(f"Uploading {filename} ({len(data)/(1024*1024):.2f} MB, from memory) to {upload_url}")
+    
+    # The body is plain bytes, so the retry adapter can resend it
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504], allowed_methods=None)
+    adapter = HTTPAdapter(max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
+    try:
+        response = session.put(
+            upload_url,
+            data=data,
+            auth=(username, password),
+            headers={'Content-Type': content_type, 'Accept': '*/*'},
+            timeout=(30, 300)
+        )
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Upload error: {str(e)}")
+        return False
+    
+    if response.status_code in [200, 201]:
+        logger.info(f"Upload successful! Status code: {response.status_code}")
+        return True
+    else:
+        logger.error(f"Upload failed! Status code: {response.status_code}")
+        logger.error(f"Response: {response.text}")
+        return False
 
 def upload_to_nexus(zip_file, nexus_url, repository, username, password, directory=None, chunk_size=1024*1024):
     """
@@ -190,14 +1022,7 @@ def upload_to_nexus(zip_file, nexus_url, repository, username, password, directo
     file_size_mb = file_size / (1024 * 1024)
     
     # Prepare upload URL
-    filename = zip_path.name
-    upload_url = f"{nexus_url.rstrip('/')}/repository/{repository}"
-    
-    # Add directory to path if specified
-    if directory:
-        upload_url = f"{upload_url}/{directory.strip('/')}"
-    
-    upload_url = f"{upload_url}/{filename}"
+    upload_url = build_upload_url(nexus_url, repository, zip_path.name, directory)
     
     logger.info(f"Uploading {zip_file} ({file_size_mb:.2f} MB) to {upload_url}")
     
@@ -217,99 +1042,70 @@ def upload_to_nexus(zip_file, nexus_url, repository, username, password, directo
     timeout = (30, 1800)
     
     try:
-        with open(zip_file, 'rb') as file_data:
-            # Setup progress bar for upload if tqdm is available
+        if urllib.parse.urlsplit(upload_url).scheme == 'http':
+            # Plain HTTP: hand the file to the kernel with sendfile instead of streaming it through Python
             if TQDM_AVAILABLE:
                 pbar = tqdm(total=file_size, unit='B', unit_scale=True, desc="Uploading to Nexus")
-                
-                # Create a generator that yields file chunks with progress updates
-                def file_chunks():
-                    bytes_read = 0
-                    start_time = time.time()
-                    
-                    while True:
-                        chunk = file_data.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        bytes_read += len(chunk)
-                        pbar.update(len(chunk))
-                        
-                        # Log additional progress info periodically
-                        if bytes_read % (50 * chunk_size) == 0:
-                            elapsed = time.time() - start_time
-                            speed_mb = (bytes_read / elapsed) / (1024 * 1024) if elapsed > 0 else 0
-                            logger.info(f"Upload in progress: {bytes_read/(1024*1024):.2f} MB sent at {speed_mb:.2f} MB/s")
-                        
-                        yield chunk
-            else:
-                # Create a generator without progress bar but with console logging
-                def file_chunks():
-                    bytes_read = 0
-                    last_progress = 0
-                    start_time = time.time()
-                    
-                    while True:
-                        chunk = file_data.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        bytes_read += len(chunk)
-                        elapsed = time.time() - start_time
-                        progress = int((bytes_read / file_size) * 100)
-                        
-                        # Log progress every 5% or at least every 30 seconds
-                        current_time = time.time()
-                        if progress >= last_progress + 5 or current_time - start_time - elapsed >= 30:
-                            speed = bytes_read / elapsed if elapsed > 0 else 0
-                            speed_mb = speed / (1024 * 1024)
-                            eta_seconds = (file_size - bytes_read) / speed if speed > 0 else 0
-                            eta_minutes = eta_seconds / 60
-                            
-                            logger.info(
-                                f"Upload progress: {progress}% ({bytes_read/(1024*1024):.2f} MB / {file_size_mb:.2f} MB) "
-                                f"- Speed: {speed_mb:.2f} MB/s - ETA: {eta_minutes:.1f} minutes"
-                            )
-                            last_progress = progress
-                        
-                        yield chunk
-            
-            # Explicitly set headers for the upload
-            headers = {
-                'Content-Type': 'application/zip',
-                'Accept': '*/*'
-            }
-            
-            # Log the start of the actual HTTP request
-            logger.info(f"Starting HTTP PUT request to {upload_url}")
             
-            # Upload to Nexus with extended timeout
-            response = session.put(
+            logger.info(f"Starting HTTP PUT request to {upload_url} (sendfile)")
+            status_code, response_text = upload_with_sendfile(
+                zip_file,
                 upload_url,
-                data=file_chunks(),
-                auth=(username, password),
-                headers=headers,
-                timeout=timeout
+                username,
+                password,
+                file_size,
+                {'Content-Type': 'application/zip', 'Accept': '*/*'},
+                timeout,
+                chunk_size=chunk_size,
+                pbar=pbar if TQDM_AVAILABLE else None
             )
-        
+        else:
+            with open(zip_file, 'rb') as file_data:
+                # Setup progress bar for upload if tqdm is available
+                if TQDM_AVAILABLE:
+                    pbar = tqdm(total=file_size, unit='B', unit_scale=True, desc="Uploading to Nexus")
+                
+                # A sized file-like body makes requests send Content-Length rather than chunked encoding
+                upload_body = UploadReader(file_data, file_size, chunk_size, pbar if TQDM_AVAILABLE else None)
+                
+                # Explicitly set headers for the upload
+                headers = {
+                    'Content-Type': 'application/zip',
+                    'Content-Length': str(file_size),
+                    'Accept': '*/*'
+                }
+                
+                # Log the start of the actual HTTP request
+                logger.info(f"Starting HTTP PUT request to {upload_url}")
+                
+                # Upload to Nexus with extended timeout
+                response = session.put(
+                    upload_url,
+                    data=upload_body,
+                    auth=(username, password),
+                    headers=headers,
+                    timeout=timeout
+                )
+                status_code, response_text = response.status_code, response.text
+            
         # Close progress bar if used
         if TQDM_AVAILABLE:
             pbar.close()
             
         # Check response
-        if response.status_code in [200, 201]:
-            logger.info(f"Upload successful! Status code: {response.status_code}")
+        if status_code in [200, 201]:
+            logger.info(f"Upload successful! Status code: {status_code}")
             return True
         else:
-            logger.error(f"Upload failed! Status code: {response.status_code}")
-            logger.error(f"Response: {response.text}")
+            logger.error(f"Upload failed! Status code: {status_code}")
+            logger.error(f"Response: {response_text}")
             return False
             
-    except requests.exceptions.Timeout:
+    except (requests.exceptions.Timeout, TimeoutError):
         logger.error("Upload timed out. This may indicate the Nexus server is struggling with large files.")
         logger.error("Try increasing timeouts in Nexus configuration or reducing file size.")
         return False
-    except requests.exceptions.ConnectionError as e:
+    except (requests.exceptions.ConnectionError, ConnectionError) as e:
         logger.error(f"Connection error: {str(e)}")
         logger.error("Check network stability and Nexus server status.")
         return False
@@ -328,7 +1124,13 @@ def main():
     parser.add_argument("--password", help="Nexus password (or use NEXUS_PASSWORD env variable)")
     parser.add_argument("--directory", help="Target directory in Nexus repository")
     parser.add_argument("--keep-zip", action="store_true", help="Keep the ZIP file after upload")
+    parser.add_argument("--parallel-parts", type=int, default=0, help="Upload the ZIP as numbered parts over this many connections at once (default: 0, single upload)")
+    parser.add_argument("--part-size", type=int, default=DEFAULT_UPLOAD_PART_SIZE // (1024 * 1024), help=f"Part size in MB for --parallel-parts (default: {DEFAULT_UPLOAD_PART_SIZE // (1024 * 1024)}MB)")
+    parser.add_argument("--raw-single-file", action="store_true", help="If the source holds a single small file, upload it as-is instead of zipping it")
+    parser.add_argument("--stream", action="store_true", help="Upload while zipping, without writing a local ZIP file")
     parser.add_argument("--chunk-size", type=int, default=1024*1024, help="Chunk size for file operations in bytes (default: 1MB)")
+    parser.add_argument("--compress-workers", type=int, default=DEFAULT_COMPRESS_WORKERS, help=f"Processes used to compress files in parallel (default: {DEFAULT_COMPRESS_WORKERS})")
+    parser.add_argument("--compress-level", type=int, choices=range(1, 10), default=None, help=f"DEFLATE level 1-9 (default: {DEFAULT_UPLOAD_COMPRESS_LEVEL}, or the library default when --max-zip-size is set; scaled to 0-3 with isal)")
     parser.add_argument("--max-memory", type=int, default=100, help="Maximum memory usage in MB (default: 100MB)")
     parser.add_argument("--temp-dir", help="Custom temporary directory for processing large files")
     parser.add_argument("--max-zip-size", type=float, default=None, help="Maximum size for zip files in GB (for splitting large files)")
@@ -345,37 +1147,105 @@ def main():
             logger.info(f"Using custom temporary directory: {args.temp_dir}")
             os.environ['TMPDIR'] = args.temp_dir
         
+        # Get credentials from args or environment variables
+        username = args.username or environ.get('NEXUS_USERNAME')
+        password = args.password or environ.get('NEXUS_PASSWORD')
+        
+        # Validate credentials and reachability before spending time on compression
+        if not username or not password:
+            logger.error("Nexus credentials not provided. Use --username/--password args or set NEXUS_USERNAME/NEXUS_PASSWORD environment variables")
+            return 1
+        if not check_nexus_access(args.nexus_url, args.repository, username, password):
+            return 1
+        
+        if FAST_DEFLATE:
+            logger.info(f"Using {FAST_DEFLATE} for DEFLATE compression")
+        else:
+            logger.info("For faster compression, install zlib-ng or isal: pip install zlib-ng")
+        if FAST_CRC32:
+            logger.info(f"Using {FAST_CRC32} for CRC32")
+        
+        # Favour speed when the archive is only a transfer vehicle; keep zlib's default when
+        # archive size is constrained
+        compress_level = args.compress_level
+        if compress_level is None and args.max_zip_size is None:
+            compress_level = DEFAULT_UPLOAD_COMPRESS_LEVEL
+        
+        if args.stream:
+            filename = Path(args.zip_file).name if args.zip_file else f"files_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+            if not stream_zip_to_nexus(args.source, filename, args.nexus_url, args.repository, username, password,
+                                       args.directory, chunk_size=args.chunk_size, compress_workers=args.compress_workers,
+                                       compress_level=compress_level):
+                return 1
+            logger.info("Process completed successfully")
+            return 0
+        
+        # Small trees are zipped in memory (or a lone file sent as-is), skipping the
+        # write and re-read of a local ZIP file. Not used when a ZIP file is wanted.
+        small_files = None
+        if not args.keep_zip and not args.zip_file:
+            small_files = probe_small_tree(args.source)
+        
+        if small_files:
+            if len(small_files) == 1 and args.raw_single_file:
+                file_path = small_files[0][0]
+                logger.info(f"Source holds a single file, uploading it without zipping: {file_path}")
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                filename = os.path.basename(file_path)
+                content_type = 'application/octet-stream'
+            else:
+                logger.info(f"Source is small ({len(small_files)} files), zipping in memory")
+                buffer = io.BytesIO()
+                create_zip_archive(args.source, buffer, chunk_size=args.chunk_size,
+                                   compress_workers=1, compress_level=compress_level)
+                data = buffer.getvalue()
+                filename = f"files_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                content_type = 'application/zip'
+            
+            if not upload_bytes_to_nexus(data, filename, args.nexus_url, args.repository, username, password,
+                                         args.directory, content_type=content_type):
+                return 1
+            logger.info("Process completed successfully")
+            return 0
+        
         # Step 1: Create ZIP archive with memory optimization
         zip_file = create_zip_archive(
             args.source, 
             args.zip_file,
             chunk_size=args.chunk_size,
-            max_memory_mb=args.max_memory
+            max_memory_mb=args.max_memory,
+            compress_workers=args.compress_workers,
+            compress_level=compress_level
         )
         
         # Check for tqdm package
         if not TQDM_AVAILABLE:
             logger.info("For progress bars, install the tqdm package: pip install tqdm")
         
-        # Get credentials from args or environment variables
-        username = args.username or environ.get('NEXUS_USERNAME')
-        password = args.password or environ.get('NEXUS_PASSWORD')
-        
-        # Validate credentials are available
-        if not username or not password:
-            logger.error("Nexus credentials not provided. Use --username/--password args or set NEXUS_USERNAME/NEXUS_PASSWORD environment variables")
-            return 1
-        
         # Step 2: Upload to Nexus with streaming
-        upload_success = upload_to_nexus(
-            zip_file, 
-            args.nexus_url, 
-            args.repository, 
-            username, 
-            password, 
-            args.directory,
-            chunk_size=args.chunk_size
-        )
+        if args.parallel_parts > 0:
+            upload_success = upload_parts_to_nexus(
+                zip_file,
+                args.nexus_url,
+                args.repository,
+                username,
+                password,
+                args.directory,
+                part_size=args.part_size * 1024 * 1024,
+                max_workers=args.parallel_parts,
+                chunk_size=args.chunk_size
+            )
+        else:
+            upload_success = upload_to_nexus(
+                zip_file, 
+                args.nexus_url, 
+                args.repository, 
+                username, 
+                password, 
+                args.directory,
+                chunk_size=args.chunk_size
+            )
         
         # Step 3: Clean up if requested and upload was successful
         if upload_success and not args.keep_zip:
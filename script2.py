@@ -5,40 +5,206 @@ import time
 import argparse
 import platform
 import shutil
+import stat
+import tarfile
 from pathlib import Path
 from tqdm import tqdm
 import psutil
 import hashlib 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import contextlib
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import math
 import mmap
 import io
 import threading
+import zlib
+from collections import deque
 from queue import Queue
-from typing import Tuple
+from typing import List, Tuple
 import fcntl
 
+# Per-file detail goes to the debug log (enable with --verbose) instead of stdout
+log = logging.getLogger(__name__)
 
-def calculate_md5(file_path: str, chunk_size: int = 1024 * 1024) -> str:
-    """Calculate MD5 hash of a file in chunks to avoid memory issues."""
-    md5 = hashlib.md5()
+# xxh3 is a non-cryptographic hash running at memory speed; used for integrity checks when installed
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# libdeflate compresses whole buffers about twice as fast as zlib at the same level
+try:
+    import deflate
+    LIBDEFLATE_AVAILABLE = True
+except ImportError:
+    LIBDEFLATE_AVAILABLE = False
+
+# io_uring submits a whole batch of small-file reads in one syscall (Linux 5.6+)
+try:
+    import liburing
+    URING_AVAILABLE = True
+except ImportError:
+    URING_AVAILABLE = False
+
+# zstd compresses several times faster than DEFLATE at a similar or better ratio
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Files up to this size are compressed in worker processes when --compress is used
+PARALLEL_COMPRESS_MAX_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Large stored files get their CRC32 computed over ranges of at least this size in threads
+PARALLEL_CRC_MIN_RANGE = 16 * 1024 * 1024  # 16MB
+
+# Auto-sized chunks are at least this large and rounded up to whole pages
+MIN_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Small files are read into one reused page-aligned buffer per thread instead of a new bytes object each
+SMALL_READ_BUFFER_SIZE = 1024 * 1024  # 1MB, grown up to the mmap threshold as needed
+_read_buffers = threading.local()
+
+# Estimated local header + central directory bytes per member, for preallocating the output
+ZIP_ENTRY_OVERHEAD = 512
+
+# Write buffer for the output archive; local headers, small members and the central
+# directory records (several small writes per member) are coalesced into writes this large
+OUTPUT_BUFFER_SIZE = 1024 * 1024  # 1MB
+
+# Per-file progress bars are only shown for files at least this large
+INNER_PROGRESS_MIN_SIZE = 100 * 1024 * 1024  # 100MB
+# The overall progress bar is advanced in steps of at least this many bytes
+PROGRESS_BATCH_SIZE = 16 * 1024 * 1024  # 16MB
+
+# Compressed chunks queued between the DEFLATE loop and its writer thread
+STREAM_WRITE_QUEUE_SIZE = 4
+
+# Memory probes are reused for this many seconds
+MEMORY_STATS_TTL = 2.0
+
+# 7-Zip progress records ("NN% ...") on its stderr, separated by \r, \b or newlines
+_PROGRESS_RE = re.compile(rb'^\s*(\d+)%')
+_PROGRESS_SPLIT_RE = re.compile(rb'[\r\n\b]+')
+
+# Trees with fewer files than this skip io_uring and the worker pool
+FAST_PATH_MAX_FILES = 4
+
+# Small files read per io_uring batch, bounded by count and total bytes
+URING_QUEUE_DEPTH = 64
+URING_BATCH_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+
+# Zip method id for Zstandard (APPNOTE 6.3.7); zipfile only knows it from Python 3.14
+ZIP_ZSTANDARD = getattr(zipfile, 'ZIP_ZSTANDARD', 93)
+ZSTD_LEVEL = 3
+CODECS = ('store', 'deflate', 'zstd')
+# DEFLATE level: 1-12 with libdeflate, capped at 9 for zlib
+DEFAULT_DEFLATE_LEVEL = 6
+
+
+def _default_digest():
+    """Return a new hash object for integrity checks: xxh3_128 if available, else 128-bit BLAKE2b."""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def calculate_digest(file_path: str, algo=None, chunk_size: int = 1024 * 1024) -> str:
+    """Calculate a file's hex digest without reading it into memory.
+    
+    algo is a hashlib name (e.g. 'md5', 'sha256') or None for the fast integrity
+    hash (xxh3_128, falling back to BLAKE2b). Uses hashlib.file_digest where
+    available, which feeds the hash from a reused buffer in C.
+    """
+    digest = algo if algo is not None else _default_digest
     try:
-        file_size = os.path.getsize(file_path)
-        
-        # Use memory mapping for all files
         with open(file_path, 'rb') as f:
-            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                # For small files, read all at once
-                if file_size < 10 * 1024 * 1024:  # 10MB
-                    md5.update(mm.read())
-                else:
-                    # For large files, read in chunks
-                    for chunk in iter(lambda: mm.read(chunk_size), b''):
-                        md5.update(chunk)
+            _advise_sequential(f)
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                return hashlib.file_digest(f, digest).hexdigest()
+            
+            hasher = hashlib.new(digest) if isinstance(digest, str) else digest()
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                hasher.update(view[:count])
+            return hasher.hexdigest()
     except Exception as e:
-        print(f"Error calculating MD5 for {file_path}: {str(e)}")
+        print(f"Error calculating digest for {file_path}: {str(e)}")
         raise
-    return md5.hexdigest()
+
+
+def calculate_md5(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Calculate MD5 hash of a file in chunks to avoid memory issues."""
+    return calculate_digest(file_path, 'md5', chunk_size)
+
+
+def scan_tree(root: str) -> Tuple[List[str], List[str], List[int]]:
+    """Walk a folder once with os.scandir; returns parallel lists (paths, rel_paths, sizes).
+    
+    Entries are sorted by name within each directory so the order is stable.
+    rel_paths use '/' separators as stored in zip files. Symlinked directories
+    are not followed, matching os.walk.
+    """
+    paths = []
+    rel_paths = []
+    sizes = []
+    prefix_len = len(os.path.join(root, ''))
+    dirs = [root]
+    while dirs:
+        current = dirs.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Error accessing {current}: {str(e)}")
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    sizes.append(entry.stat().st_size)
+                    paths.append(entry.path)
+                    rel_paths.append(entry.path[prefix_len:])
+            except OSError as e:
+                print(f"Error accessing {entry.path}: {str(e)}")
+        # Reversed so subdirectories come off the stack in name order
+        dirs.extend(reversed(subdirs))
+    
+    if os.sep != '/':
+        rel_paths = [rel_path.replace(os.sep, '/') for rel_path in rel_paths]
+    return paths, rel_paths, sizes
+
+
+def count_files(root: str, limit: int) -> int:
+    """Count regular files under root, stopping as soon as limit is reached."""
+    count = 0
+    dirs = [root]
+    while dirs and count < limit:
+        try:
+            with os.scandir(dirs.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+                        if count >= limit:
+                            break
+        except OSError:
+            continue
+    return count
 
 
 def validate_zip_integrity(zip_file, source_folder):
@@ -50,14 +216,7 @@ def validate_zip_integrity(zip_file, source_folder):
         zip_files = zf.namelist()
     
     # Get list of files in the source folder
-    source_files = []
-    for root, _, files in os.walk(source_folder):
-        for file in files:
-            full_path = os.path.join(root, file)
-            rel_path = os.path.relpath(full_path, source_folder)
-            # Convert Windows paths to zipfile format
-            rel_path = rel_path.replace('\\', '/')
-            source_files.append(rel_path)
+    _, source_files, _ = scan_tree(source_folder)
     
     # Check if file lists match
     missing_files = set(source_files) - set(zip_files)
@@ -70,9 +229,31 @@ def validate_zip_integrity(zip_file, source_folder):
     return True
 
 
-def get_system_memory():
-    """Get available system memory in bytes across different operating systems."""
+def _ttl_cache(seconds):
+    """Cache a no-argument function's result for the given number of seconds."""
+    def decorator(func):
+        cached = None  # (timestamp, value)
+        
+        @functools.wraps(func)
+        def wrapper():
+            nonlocal cached
+            now = time.monotonic()
+            if cached is None or now - cached[0] > seconds:
+                cached = (now, func())
+            return cached[1]
+        return wrapper
+    return decorator
+
+
+@_ttl_cache(MEMORY_STATS_TTL)
+def get_memory_stats() -> Tuple[int, int]:
+    """Get (total, available) system memory in bytes with a single probe.
+    
+    Results are cached for MEMORY_STATS_TTL seconds, so callers in loops do not
+    re-read /proc/meminfo or spawn vm_stat each time.
+    """
     system = platform.system().lower()
+    total = available = None
     
     if system == 'windows':
         # Windows memory detection
@@ -93,15 +274,19 @@ def get_system_memory():
         memory_status = MEMORYSTATUSEX()
         memory_status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
         ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(memory_status))
-        return memory_status.ullAvailPhys
+        return memory_status.ullTotalPhys, memory_status.ullAvailPhys
     
     elif system == 'linux':
-        # Linux memory detection
+        # Linux memory detection: total needs no file, available comes from /proc/meminfo
         try:
-            with open('/proc/meminfo', 'r') as meminfo:
-                for line in meminfo:
-                    if 'MemAvailable' in line:
-                        return int(line.split()[1]) * 1024  # Convert KB to bytes
+            total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        except (ValueError, OSError):
+            pass
+        try:
+            with open('/proc/meminfo', 'rb') as meminfo:
+                match = re.search(rb'MemAvailable:\s+(\d+)', meminfo.read())
+            if match:
+                available = int(match.group(1)) * 1024  # Convert KB to bytes
         except:
             pass
     
@@ -111,68 +296,51 @@ def get_system_memory():
             # Use vm_stat command
             vm_stat = subprocess.check_output(['vm_stat']).decode()
             pages_free = int(vm_stat.split('Pages free:')[1].split('.')[0].strip())
-            pages_active = int(vm_stat.split('Pages active:')[1].split('.')[0].strip())
             pages_inactive = int(vm_stat.split('Pages inactive:')[1].split('.')[0].strip())
             page_size = int(subprocess.check_output(['pagesize']).decode().strip())
-            return (pages_free + pages_inactive) * page_size
+            available = (pages_free + pages_inactive) * page_size
+        except:
+            pass
+        try:
+            # sysctlbyname through libc avoids spawning the sysctl command
+            import ctypes
+            libc = ctypes.CDLL('libc.dylib')
+            size = ctypes.c_uint64()
+            length = ctypes.c_size_t(ctypes.sizeof(size))
+            if libc.sysctlbyname(b'hw.memsize', ctypes.byref(size), ctypes.byref(length), None, 0) == 0:
+                total = size.value
         except:
             pass
     
     # Fallback to psutil if platform-specific methods fail
-    return psutil.virtual_memory().available
+    if total is None or available is None:
+        virtual_memory = psutil.virtual_memory()
+        total = virtual_memory.total if total is None else total
+        available = virtual_memory.available if available is None else available
+    return total, available
+
+
+def get_system_memory():
+    """Get available system memory in bytes across different operating systems."""
+    return get_memory_stats()[1]
 
 
 def get_total_memory():
     """Get total system memory in bytes across different operating systems."""
-    system = platform.system().lower()
-    
-    if system == 'windows':
-        import ctypes
-        class MEMORYSTATUSEX(ctypes.Structure):
-            _fields_ = [
-                ("dwLength", ctypes.c_ulong),
-                ("dwMemoryLoad", ctypes.c_ulong),
-                ("ullTotalPhys", ctypes.c_ulonglong),
-                ("ullAvailPhys", ctypes.c_ulonglong),
-                ("ullTotalPageFile", ctypes.c_ulonglong),
-                ("ullAvailPageFile", ctypes.c_ulonglong),
-                ("ullTotalVirtual", ctypes.c_ulonglong),
-                ("ullAvailVirtual", ctypes.c_ulonglong),
-                ("ullAvailExtendedVirtual", ctypes.c_ulonglong)
-            ]
-        
-        memory_status = MEMORYSTATUSEX()
-        memory_status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
-        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(memory_status))
-        return memory_status.ullTotalPhys
-    
-    elif system == 'linux':
-        try:
-            with open('/proc/meminfo', 'r') as meminfo:
-                for line in meminfo:
-                    if 'MemTotal' in line:
-                        return int(line.split()[1]) * 1024  # Convert KB to bytes
-        except:
-            pass
-    
-    elif system == 'darwin':  # macOS
-        try:
-            # Use sysctl command
-            total_memory = subprocess.check_output(['sysctl', '-n', 'hw.memsize']).decode().strip()
-            return int(total_memory)
-        except:
-            pass
-    
-    # Fallback to psutil if platform-specific methods fail
-    return psutil.virtual_memory().total
+    return get_memory_stats()[0]
+
+
+def _align_to_page(size: int) -> int:
+    """Round size up to a multiple of the page size."""
+    return -(-size // mmap.PAGESIZE) * mmap.PAGESIZE
 
 
 def get_recommended_chunk_size():
     """Calculate recommended chunk size based on available memory."""
     available_memory = get_system_memory()
-    # Use 1% of available memory, but not more than 64MB and not less than 8KB
-    chunk_size = min(max(available_memory // 100, 8192), 64 * 1024 * 1024)
-    return chunk_size
+    # Use 1% of available memory, but not more than 64MB and not less than 1MB
+    chunk_size = min(max(available_memory // 100, MIN_CHUNK_SIZE), 64 * 1024 * 1024)
+    return _align_to_page(chunk_size)
 
 
 def print_memory_info():
@@ -201,8 +369,8 @@ def print_memory_info():
 
 def get_optimal_chunk_size(file_size, available_memory):
     """Calculate optimal chunk size based on file size and available memory."""
-    # Use 1% of available memory, but not more than 64MB and not less than 8KB
-    memory_based = min(max(available_memory // 100, 8192), 64 * 1024 * 1024)
+    # Use 1% of available memory, but not more than 64MB and not less than 1MB
+    memory_based = _align_to_page(min(max(available_memory // 100, MIN_CHUNK_SIZE), 64 * 1024 * 1024))
     
     # For very large files, use larger chunks to reduce I/O operations
     if file_size > 1 * 1024 * 1024 * 1024:  # 1GB
@@ -213,14 +381,427 @@ def get_optimal_chunk_size(file_size, available_memory):
     return memory_based
 
 
-def process_single_file(file_info: Tuple[str, str, int], output_zip: str, compress: bool, available_memory: int) -> None:
-    """Process a single file and add it to the zip archive with retry mechanism."""
+def _advise_sequential(file_handle, mm=None, prefetch=False) -> None:
+    """Hint the kernel that a file (and its mapping) will be read once, front to back.
+    
+    prefetch also asks for the whole file to be read ahead; only use it when the
+    file fits comfortably in the page cache.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(file_handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if prefetch:
+                os.posix_fadvise(file_handle.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+    if mm is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        try:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _drop_consumed_pages(mm, released: int, consumed: int) -> int:
+    """Unmap pages of a read-only mapping below consumed to keep RSS flat; returns the new released offset."""
+    end = consumed - consumed % mmap.PAGESIZE
+    if end > released and hasattr(mmap, 'MADV_DONTNEED'):
+        try:
+            mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+        except OSError:
+            return released
+        return end
+    return released
+
+
+def _zlib_deflater(deflate_level: int):
+    """Raw DEFLATE compressobj for zip members; zlib tops out at level 9."""
+    return zlib.compressobj(min(deflate_level, 9), zlib.DEFLATED, -15)
+
+
+def _compress_bytes(data: bytes, codec: str, deflate_level: int = DEFAULT_DEFLATE_LEVEL) -> bytes:
+    """Compress data to a zip member payload: raw DEFLATE (libdeflate if installed) or a zstd frame."""
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if LIBDEFLATE_AVAILABLE:
+        return deflate.deflate_compress(data, deflate_level)
+    compressor = _zlib_deflater(deflate_level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _read_small_file(f, size: int) -> memoryview:
+    """Read up to size bytes into this thread's reused buffer; the view is valid until the next call."""
+    buffer = getattr(_read_buffers, 'buffer', None)
+    if buffer is None or len(buffer) < size:
+        # Anonymous mappings are page-aligned, as O_DIRECT reads require; private so
+        # forked pool workers get their own copy instead of sharing the pages
+        buffer = mmap.mmap(-1, _align_to_page(max(size, SMALL_READ_BUFFER_SIZE)), flags=mmap.MAP_PRIVATE)
+        _read_buffers.buffer = buffer
+    view = memoryview(buffer)[:size]
+    count = 0
+    while count < size:
+        n = f.readinto(view[count:])
+        if not n:
+            break
+        count += n
+    return view[:count]
+
+
+def _compress_worker(file_info: Tuple[str, str, int], codec: str = 'deflate',
+                     deflate_level: int = DEFAULT_DEFLATE_LEVEL) -> Tuple[int, bytes, int]:
+    """Compress a file with the given codec in a worker process; returns (crc, data, size)."""
+    file_path, _, file_size = file_info
+    with open(file_path, 'rb') as f:
+        data = _read_small_file(f, file_size)
+    return zlib.crc32(data), _compress_bytes(data, codec, deflate_level), len(data)
+
+
+def uring_supported() -> bool:
+    """True if liburing is installed and the kernel is new enough for io_uring reads (5.6+)."""
+    if not URING_AVAILABLE or platform.system() != 'Linux':
+        return False
+    try:
+        major, minor = (int(part) for part in os.uname().release.split('.')[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (5, 6)
+
+
+class UringBatchReader:
+    """Read batches of whole small files through one io_uring instance.
+    
+    Every read in a batch is queued and submitted with a single syscall, then the
+    completions are collected; this replaces an open/read/close round trip per file.
+    """
+    
+    def __init__(self, queue_depth: int = URING_QUEUE_DEPTH):
+        self.queue_depth = queue_depth
+        self.ring = liburing.Ring()
+        self.cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(queue_depth, self.ring)
+    
+    def read(self, file_infos) -> list:
+        """Read up to queue_depth files; returns a bytearray or the OSError for each, in order."""
+        results = [None] * len(file_infos)
+        fds = [None] * len(file_infos)
+        inflight = 0
+        try:
+            for i, (file_path, _, file_size) in enumerate(file_infos):
+                try:
+                    fds[i] = os.open(file_path, os.O_RDONLY)
+                except OSError as e:
+                    results[i] = e
+                    continue
+                results[i] = bytearray(file_size)
+                if file_size:
+                    sqe = liburing.io_uring_get_sqe(self.ring)
+                    liburing.io_uring_prep_read(sqe, fds[i], results[i], 0)
+                    liburing.io_uring_sqe_set_data64(sqe, i)
+                    inflight += 1
+            liburing.io_uring_submit(self.ring)
+            
+            while inflight:
+                liburing.io_uring_wait_cqe(self.ring, self.cqe)
+                entry = self.cqe[0]
+                i, res = entry.user_data, entry.res
+                liburing.io_uring_cqe_seen(self.ring, entry)
+                inflight -= 1
+                if res < 0:
+                    results[i] = OSError(-res, os.strerror(-res), file_infos[i][0])
+                elif res < len(results[i]):
+                    # Short read (rare for regular files): finish it synchronously
+                    buffer = results[i]
+                    view = memoryview(buffer)
+                    while res < len(buffer):
+                        count = os.preadv(fds[i], [view[res:]], res)
+                        if not count:
+                            break  # File shrank since it was scanned
+                        res += count
+                    view.release()
+                    del buffer[res:]
+        finally:
+            for fd in fds:
+                if fd is not None:
+                    os.close(fd)
+        return results
+    
+    def close(self) -> None:
+        liburing.io_uring_queue_exit(self.ring)
+
+
+def _new_zip_info(zf: zipfile.ZipFile, rel_path: str, compress_type: int) -> zipfile.ZipInfo:
+    """Create a ZipInfo for a member written directly to zf.fp and check it against the archive."""
+    zip_info = zipfile.ZipInfo(rel_path)
+    # zipfile < 3.14 rejects the zstd method id in _writecheck, so check as stored first
+    zip_info.compress_type = zipfile.ZIP_STORED
+    zip_info.header_offset = zf.fp.tell()
+    zf._writecheck(zip_info)
+    zip_info.compress_type = compress_type
+    if compress_type == ZIP_ZSTANDARD:
+        zip_info.extract_version = max(zip_info.extract_version, 63)
+    zf._didModify = True
+    return zip_info
+
+
+def _check_entry_size(zf: zipfile.ZipFile, zip_info: zipfile.ZipInfo, written: int, file_size: int) -> None:
+    """Drop a member whose source did not yield the scanned size, so it is never recorded with that size.
+    
+    The archive is rewound to the member's header; the next member (or the
+    central directory) overwrites what was written.
+    """
+    if written != file_size:
+        zf.fp.seek(zip_info.header_offset)
+        raise RuntimeError(f"{zip_info.filename} changed size while zipping "
+                           f"({file_size} bytes scanned, {written} bytes read)")
+
+
+def _write_compressed_entry(zf: zipfile.ZipFile, rel_path: str, crc: int, compressed: bytes, file_size: int,
+                            compress_type: int = zipfile.ZIP_DEFLATED) -> None:
+    """Append an entry whose payload (compressed, or raw for ZIP_STORED) is already in memory.
+    
+    zipfile has no public API for this, so the local header and data are written
+    directly and the ZipInfo is registered for the central directory, the same way
+    ZipFile.writestr does internally.
+    """
+    zip_info = _new_zip_info(zf, rel_path, compress_type)
+    zip_info.CRC = crc
+    zip_info.file_size = file_size
+    zip_info.compress_size = len(compressed)
+    zf.fp.write(zip_info.FileHeader())
+    zf.fp.write(compressed)
+    zf.filelist.append(zip_info)
+    zf.NameToInfo[zip_info.filename] = zip_info
+    zf.start_dir = zf.fp.tell()
+
+
+def _gf2_matrix_times(mat, vec):
+    """Multiply a 32x32 GF(2) matrix by a 32-bit vector."""
+    result = 0
+    i = 0
+    while vec:
+        if vec & 1:
+            result ^= mat[i]
+        vec >>= 1
+        i += 1
+    return result
+
+
+def _gf2_matrix_square(square, mat):
+    """Store mat * mat in square."""
+    for n in range(32):
+        square[n] = _gf2_matrix_times(mat, mat[n])
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """Combine CRC32s of two consecutive blocks, as zlib's crc32_combine (not exposed by Python)."""
+    if len2 <= 0:
+        return crc1
+    
+    even = [0] * 32
+    odd = [0] * 32
+    # Operator for one zero bit
+    odd[0] = 0xEDB88320
+    row = 1
+    for n in range(1, 32):
+        odd[n] = row
+        row <<= 1
+    _gf2_matrix_square(even, odd)  # two zero bits
+    _gf2_matrix_square(odd, even)  # four zero bits
+    
+    # Apply len2 zero bytes to crc1, one bit of len2 per squaring
+    while True:
+        _gf2_matrix_square(even, odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        _gf2_matrix_square(odd, even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+
+def parallel_crc32(mm, file_size: int, nthreads: int = None) -> int:
+    """CRC32 of a buffer computed over contiguous ranges in threads (zlib releases the GIL)."""
+    nthreads = nthreads or os.cpu_count() or 1
+    range_size = max(PARALLEL_CRC_MIN_RANGE, -(-file_size // nthreads))
+    view = memoryview(mm)
+    try:
+        ranges = [(start, min(start + range_size, file_size)) for start in range(0, file_size, range_size)]
+        with ThreadPoolExecutor(max_workers=len(ranges) or 1) as executor:
+            crcs = list(executor.map(lambda r: zlib.crc32(view[r[0]:r[1]]), ranges))
+        
+        crc = 0
+        for (start, end), part_crc in zip(ranges, crcs):
+            crc = crc32_combine(crc, part_crc, end - start)
+        return crc
+    finally:
+        view.release()
+
+
+def _kernel_copy(in_fd: int, out_fd: int, offset: int, count: int) -> int:
+    """Copy bytes between files inside the kernel; returns the number copied (0 if unsupported)."""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            return os.copy_file_range(in_fd, out_fd, count, offset)
+        except OSError:
+            pass  # e.g. EXDEV on older kernels or unsupported filesystems
+    if hasattr(os, 'sendfile') and platform.system() == 'Linux':
+        try:
+            return os.sendfile(out_fd, in_fd, offset, count)
+        except OSError:
+            pass
+    return 0
+
+
+def _write_stored_entry(zf: zipfile.ZipFile, rel_path: str, file_handle, mm, file_size: int, crc: int,
+                        chunk_size: int, pbar) -> None:
+    """Write a ZIP_STORED member whose CRC is already known, skipping zipfile's CRC pass.
+    
+    The data is copied file-to-file in the kernel where possible; the mmap is
+    the fallback and finishes any part the kernel copy did not.
+    """
+    zip_info = _new_zip_info(zf, rel_path, zipfile.ZIP_STORED)
+    zip_info.CRC = crc
+    zip_info.file_size = file_size
+    zip_info.compress_size = file_size
+    zf.fp.write(zip_info.FileHeader())
+    zf.fp.flush()
+    data_start = zf.fp.tell()
+    
+    offset = 0
+    while offset < file_size:
+        copied = _kernel_copy(file_handle.fileno(), zf.fp.fileno(), offset, min(chunk_size, file_size - offset))
+        if not copied:
+            break
+        offset += copied
+        pbar.update(copied)
+    # Resync the buffered writer with the fd position the kernel copy advanced
+    zf.fp.seek(data_start + offset)
+    
+    written = offset
+    view = memoryview(mm)
+    try:
+        for start in range(offset, file_size, chunk_size):
+            chunk = view[start:start + chunk_size]
+            zf.fp.write(chunk)
+            written += len(chunk)
+            pbar.update(len(chunk))
+    finally:
+        view.release()
+    _check_entry_size(zf, zip_info, written, file_size)
+    zip_info.file_size = zip_info.compress_size = written
+    zf.filelist.append(zip_info)
+    zf.NameToInfo[zip_info.filename] = zip_info
+    zf.start_dir = zf.fp.tell()
+
+
+def _write_streamed_entry(zf: zipfile.ZipFile, rel_path: str, mm, file_size: int, chunk_size: int, pbar,
+                          codec: str, crc: int = None, deflate_level: int = DEFAULT_DEFLATE_LEVEL,
+                          io_depth: int = STREAM_WRITE_QUEUE_SIZE) -> None:
+    """Stream a large buffer into the archive as a deflate or zstd member.
+    
+    zstd uses its own worker threads; DEFLATE hands up to io_depth compressed chunks
+    to a writer thread. When crc is given (e.g. from parallel_crc32)
+    the compression loop does no CRC work; otherwise it is computed as data goes by.
+    The compressed size is unknown until the data is written, so the local header is
+    rewritten afterwards, as zipfile does for seekable outputs.
+    """
+    zip_info = _new_zip_info(zf, rel_path, ZIP_ZSTANDARD if codec == 'zstd' else zipfile.ZIP_DEFLATED)
+    zip_info.file_size = file_size
+    zip_info.CRC = 0
+    zip_info.compress_size = 0
+    zip64 = file_size * 1.05 > zipfile.ZIP64_LIMIT
+    zf.fp.write(zip_info.FileHeader(zip64))
+    data_start = zf.fp.tell()
+    
+    writer_thread = None
+    writer_errors = []
+    if codec == 'zstd':
+        writer = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1).stream_writer(zf.fp, size=file_size, closefd=False)
+        compress, finish = writer.write, writer.close
+    else:
+        # DEFLATE is serial per stream, so overlap it with the writes instead: zlib and
+        # file writes both release the GIL while a writer thread drains a bounded queue
+        compressor = _zlib_deflater(deflate_level)
+        out_queue = Queue(maxsize=io_depth)
+        
+        def drain():
+            while True:
+                data = out_queue.get()
+                if data is None:
+                    return
+                if not writer_errors:
+                    try:
+                        zf.fp.write(data)
+                    except Exception as e:
+                        writer_errors.append(e)
+        
+        writer_thread = threading.Thread(target=drain, daemon=True)
+        writer_thread.start()
+        compress = lambda chunk: out_queue.put(compressor.compress(chunk))
+        finish = lambda: out_queue.put(compressor.flush())
+    
+    running_crc = 0
+    consumed = 0
+    released = 0
+    view = memoryview(mm)
+    try:
+        for start in range(0, file_size, chunk_size):
+            if writer_errors:
+                break
+            chunk = view[start:start + chunk_size]
+            if crc is None:
+                running_crc = zlib.crc32(chunk, running_crc)
+            compress(chunk)
+            consumed += len(chunk)
+            pbar.update(len(chunk))
+            released = _drop_consumed_pages(mm, released, start + len(chunk))
+        finish()
+    finally:
+        view.release()
+        if writer_thread is not None:
+            out_queue.put(None)
+            writer_thread.join()
+    if writer_errors:
+        raise writer_errors[0]
+    _check_entry_size(zf, zip_info, consumed, file_size)
+    
+    zip_info.file_size = consumed
+    zip_info.CRC = crc if crc is not None else running_crc
+    zip_info.compress_size = zf.fp.tell() - data_start
+    if not zip64 and zip_info.compress_size > zipfile.ZIP64_LIMIT:
+        raise RuntimeError("Compressed size unexpectedly exceeded ZIP64 limit")
+    zf.fp.seek(zip_info.header_offset)
+    zf.fp.write(zip_info.FileHeader(zip64))
+    zf.fp.seek(data_start + zip_info.compress_size)
+    zf.filelist.append(zip_info)
+    zf.NameToInfo[zip_info.filename] = zip_info
+    zf.start_dir = zf.fp.tell()
+
+
+def _file_progress(file_path: str, file_size: int, chunk_size: int) -> tqdm:
+    """Per-file progress bar with coalesced updates; disabled for files under INNER_PROGRESS_MIN_SIZE."""
+    return tqdm(total=file_size, unit='B', unit_scale=True, desc=f"Processing {os.path.basename(file_path)}",
+                mininterval=0.5, miniters=chunk_size * 4, disable=file_size < INNER_PROGRESS_MIN_SIZE)
+
+
+def process_single_file(file_info: Tuple[str, str, int], zf: zipfile.ZipFile, codec: str, available_memory: int,
+                        progress: tqdm = None, deflate_level: int = DEFAULT_DEFLATE_LEVEL,
+                        io_depth: int = STREAM_WRITE_QUEUE_SIZE) -> None:
+    """Process a single file and add it to the open zip archive with retry mechanism.
+    
+    progress is the overall progress bar; the file name is shown on it rather than printed.
+    """
     file_path, rel_path, file_size = file_info
     chunk_size = get_optimal_chunk_size(file_size, available_memory)
-    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    compression = zipfile.ZIP_STORED if codec == 'store' else zipfile.ZIP_DEFLATED
     
-    # Print which file is being processed
-    print(f"\nProcessing: {os.path.basename(file_path)} ({file_size / (1024**2):.2f} MB)")
+    if progress is not None:
+        progress.set_postfix_str(os.path.basename(file_path), refresh=False)
     
     max_retries = 3
     retry_delay = 1  # seconds
@@ -252,38 +833,62 @@ def process_single_file(file_info: Tuple[str, str, int], output_zip: str, compre
                     pass
                 
                 mmap_obj = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+                # Headers are sized from the scan; a file that changed since then is not archived
+                if len(mmap_obj) != file_size:
+                    raise RuntimeError(f"{rel_path} changed size since the scan "
+                                       f"({file_size} bytes scanned, {len(mmap_obj)} bytes now)")
+                _advise_sequential(file_handle, mmap_obj, prefetch=file_size <= available_memory // 2)
                 
                 # For very large files, use larger chunks
                 if file_size > 1024 * 1024 * 1024:  # 1GB
                     chunk_size = max(chunk_size, 16 * 1024 * 1024)  # 16MB chunks
                 
-                # Process the file in chunks
-                with zipfile.ZipFile(output_zip, 'a', compression, allowZip64=True) as zf:
+                # Stored files that fit in the page cache: CRC in parallel, then copy in the kernel
+                if compression == zipfile.ZIP_STORED and file_size <= available_memory // 2:
+                    crc = parallel_crc32(mmap_obj, file_size)
+                    pbar = _file_progress(file_path, file_size, chunk_size)
+                    _write_stored_entry(zf, rel_path, file_handle, mmap_obj, file_size, crc, chunk_size, pbar)
+                    pbar.close()
+                elif codec != 'store':
+                    # CRC in parallel up front (when cached) so the serial loop only compresses
+                    crc = parallel_crc32(mmap_obj, file_size) if file_size <= available_memory // 2 else None
+                    pbar = _file_progress(file_path, file_size, chunk_size)
+                    _write_streamed_entry(zf, rel_path, mmap_obj, file_size, chunk_size, pbar, codec, crc,
+                                          deflate_level, io_depth)
+                    pbar.close()
+                else:
+                    # Process the file in chunks
                     # Create a ZipInfo object with ZIP64 support
                     zip_info = zipfile.ZipInfo(rel_path)
                     zip_info.file_size = file_size
                     zip_info.compress_type = compression
-                    
+                
                     with zf.open(zip_info, 'w') as dest:
                         bytes_written = 0
                         # Create progress bar for large files
-                        pbar = tqdm(total=file_size, unit='B', unit_scale=True, 
-                                  desc=f"Processing {os.path.basename(file_path)}")
-                        while bytes_written < file_size:
-                            try:
-                                chunk = mmap_obj.read(chunk_size)
-                                if not chunk:
-                                    break
-                                dest.write(chunk)
-                                bytes_written += len(chunk)
-                                pbar.update(len(chunk))
-                            except IOError as e:
-                                if attempt < max_retries - 1:
-                                    print(f"\nI/O error reading chunk, retrying... (Attempt {attempt + 1}/{max_retries})")
-                                    time.sleep(retry_delay)
-                                    continue
-                                else:
-                                    raise
+                        pbar = _file_progress(file_path, file_size, chunk_size)
+                        # Zero-copy slices of the mapping instead of a new bytes object per chunk
+                        view = memoryview(mmap_obj)
+                        released = 0
+                        try:
+                            while bytes_written < file_size:
+                                try:
+                                    chunk = view[bytes_written:bytes_written + chunk_size]
+                                    if not chunk:
+                                        break
+                                    dest.write(chunk)
+                                    bytes_written += len(chunk)
+                                    pbar.update(len(chunk))
+                                    released = _drop_consumed_pages(mmap_obj, released, bytes_written)
+                                except IOError as e:
+                                    if attempt < max_retries - 1:
+                                        print(f"\nI/O error reading chunk, retrying... (Attempt {attempt + 1}/{max_retries})")
+                                        time.sleep(retry_delay)
+                                        continue
+                                    else:
+                                        raise
+                        finally:
+                            view.release()
                         pbar.close()
             else:
                 # For small files, read them entirely into memory
@@ -293,17 +898,15 @@ def process_single_file(file_info: Tuple[str, str, int], output_zip: str, compre
                 except (AttributeError, IOError):
                     pass
                 
-                data = file_handle.read()
-                with zipfile.ZipFile(output_zip, 'a', compression, allowZip64=True) as zf:
-                    # Create a ZipInfo object with ZIP64 support
-                    zip_info = zipfile.ZipInfo(rel_path)
-                    zip_info.file_size = file_size
-                    zip_info.compress_type = compression
-                    
-                    with zf.open(zip_info, 'w') as dest:
-                        dest.write(data)
+                data = _read_small_file(file_handle, file_size)
+                if codec != 'store':
+                    _write_compressed_entry(zf, rel_path, zlib.crc32(data), _compress_bytes(data, codec, deflate_level),
+                                            len(data), ZIP_ZSTANDARD if codec == 'zstd' else zipfile.ZIP_DEFLATED)
+                else:
+                    # The data is in memory already, so the header is written once with the
+                    # final CRC instead of being patched after zf.open's write
+                    _write_compressed_entry(zf, rel_path, zlib.crc32(data), data, len(data), zipfile.ZIP_STORED)
             
-            print(f"Completed: {os.path.basename(file_path)}")
             return  # Success, exit the retry loop
             
         except IOError as e:
@@ -331,49 +934,43 @@ def process_single_file(file_info: Tuple[str, str, int], output_zip: str, compre
                 pass
 
 
-def quick_validate_zip(source_folder: str, zip_file: str) -> bool:
-    """Quickly validate zip integrity by comparing file sizes and basic metadata."""
+def quick_validate_zip(source_folder: str, zip_file: str, scan=None, entries=None) -> bool:
+    """Quickly validate zip integrity by comparing file sizes and basic metadata.
+    
+    scan is a scan_tree result to reuse; the folder is scanned if it is not given.
+    entries is the ZipInfo list kept by the writer; the archive is only reopened
+    to read its central directory when it is not given.
+    """
     print("\nValidating zip integrity...")
     
     # Get list of files in the zip
-    with zipfile.ZipFile(zip_file, 'r') as zf:
-        zip_files = {info.filename: info for info in zf.infolist()}
+    if entries is None:
+        with zipfile.ZipFile(zip_file, 'r') as zf:
+            entries = zf.infolist()
+    zip_files = {info.filename: info.file_size for info in entries}
     
     # Track validation results
     missing_files = []
     size_mismatches = []
-    total_files = 0
-    
-    # Walk through source directory
-    for root, _, files in os.walk(source_folder):
-        for file in files:
-            total_files += 1
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, source_folder)
-            # Convert Windows paths to zipfile format
-            rel_path = rel_path.replace('\\', '/')
-            
-            try:
-                # Skip zip files
-                if file_path.lower().endswith('.zip'):
-                    continue
-                    
-                # Get source file size
-                source_size = os.path.getsize(file_path)
-                
-                # Check if file exists in zip
-                if rel_path not in zip_files:
-                    missing_files.append(rel_path)
-                    continue
-                
-                # Compare file sizes
-                zip_size = zip_files[rel_path].file_size
-                if source_size != zip_size:
-                    size_mismatches.append((rel_path, source_size, zip_size))
-                
-            except Exception as e:
-                print(f"Error validating {file_path}: {str(e)}")
-                return False
+    
+    # Compare against one scan of the source directory
+    paths, rel_paths, sizes = scan if scan is not None else scan_tree(source_folder)
+    total_files = len(paths)
+    zip_size_of = zip_files.get
+    for file_path, rel_path, source_size in zip(paths, rel_paths, sizes):
+        # Skip zip files (lowercase only the 4-character suffix, not the whole path)
+        if file_path[-4:].lower() == '.zip':
+            continue
+        
+        # Check if file exists in zip
+        zip_size = zip_size_of(rel_path)
+        if zip_size is None:
+            missing_files.append(rel_path)
+            continue
+        
+        # Compare file sizes
+        if source_size != zip_size:
+            size_mismatches.append((rel_path, source_size, zip_size))
     
     # Print validation results
     if missing_files:
@@ -395,12 +992,62 @@ def quick_validate_zip(source_folder: str, zip_file: str) -> bool:
         return False
     
     print(f"\nValidation successful: All {total_files} files verified")
-    print(f"Total size: {sum(info.file_size for info in zip_files.values()) / (1024**2):.2f} MB")
+    print(f"Total size: {sum(zip_files.values()) / (1024**2):.2f} MB")
     return True
 
 
-def zip_with_builtin(source_folder, output_zip, chunk_size=None, compress=False, validate=False):
-    """Zip a folder using Python's built-in zipfile module with sequential processing."""
+@contextlib.contextmanager
+def open_preallocated(path: str, size: int):
+    """Open path for writing with size bytes allocated up front by posix_fallocate.
+    
+    One allocation gives the filesystem a chance to lay the file out contiguously
+    instead of growing it write by write. The unused tail is truncated on exit, at
+    the file position left by the last write. Writes go through an OUTPUT_BUFFER_SIZE
+    buffer, so the central directory is flushed in a few large writes.
+    """
+    f = open(path, 'w+b', buffering=OUTPUT_BUFFER_SIZE)
+    try:
+        if hasattr(os, 'posix_fallocate') and size > 0:
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError:
+                pass  # Unsupported filesystem or not enough space; grow as we write
+        yield f
+    finally:
+        try:
+            f.truncate()
+        finally:
+            f.close()
+
+
+def zip_with_builtin(source_folder, output_zip, chunk_size=None, compress=False, validate=False, workers=None, codec=None,
+                     deflate_level=DEFAULT_DEFLATE_LEVEL, use_uring=True, deep_validate=False,
+                     io_depth=STREAM_WRITE_QUEUE_SIZE):
+    """Zip a folder using Python's built-in zipfile module.
+    
+    codec is 'store', 'deflate' or 'zstd'; by default it follows compress. DEFLATE
+    uses libdeflate for whole files when installed, zlib otherwise. With
+    compression enabled, files up to PARALLEL_COMPRESS_MAX_SIZE are compressed
+    in a process pool and written by this process in scan order; larger files are
+    streamed in directly, with up to io_depth compressed chunks queued for a writer
+    thread. Without the pool, small files are read in batches through
+    io_uring when use_uring is set and it is supported. The archive is opened once,
+    so the central directory is written a single time at the end.
+    
+    CRCs and sizes are taken from the data as it is written, and a file whose
+    size changed since the scan is left out, so validate checks the entries kept
+    in memory against the scan; deep_validate also reads the archive back and
+    checks every member against its CRC.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if codec is None:
+        codec = 'deflate' if compress else 'store'
+    if codec == 'zstd' and not ZSTD_AVAILABLE:
+        print("zstandard not installed (pip install zstandard); falling back to deflate")
+        codec = 'deflate'
+    compress = codec != 'store'
+    compress_type = ZIP_ZSTANDARD if codec == 'zstd' else zipfile.ZIP_DEFLATED
     start_time = time.time()
     
     # Get available memory
@@ -415,48 +1062,110 @@ def zip_with_builtin(source_folder, output_zip, chunk_size=None, compress=False,
     all_files = []
     total_size = 0
     print("Scanning files...")
-    for root, _, files in os.walk(source_folder):
-        for file in sorted(files):  # Sort files to ensure consistent order
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, source_folder)
-            try:
-                # Skip zip files
-                if file_path.lower().endswith('.zip'):
-                    print(f"Skipping zip file: {file_path}")
-                    continue
-                    
-                file_size = os.path.getsize(file_path)
-                total_size += file_size
-                file_info = (file_path, rel_path, file_size)
-                all_files.append(file_info)
-                print(f"Found: {file_path} ({file_size / (1024**2):.2f} MB)")
-            except Exception as e:
-                print(f"Error accessing {file_path}: {str(e)}")
+    scan = scan_tree(source_folder)
+    for file_info in zip(*scan):  # Sorted for consistent order
+        file_path, _, file_size = file_info
+        # Skip zip files
+        if file_path[-4:].lower() == '.zip':
+            log.debug("Skipping zip file: %s", file_path)
+            continue
+        
+        total_size += file_size
+        all_files.append(file_info)
+        log.debug("Found: %s (%.2f MB)", file_path, file_size / (1024**2))
     
     print(f"\nFound {len(all_files)} files, total size: {total_size / (1024**2):.2f} MB")
     
-    compression_str = "with compression" if compress else "without compression"
+    compression_str = f"with {codec} compression" if compress else "without compression"
     print(f"\nStarting to zip {source_folder} {compression_str} (Total size: {total_size / (1024**2):.2f} MB)")
     
-    # Create empty zip file first with ZIP64 support
-    with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_STORED if not compress else zipfile.ZIP_DEFLATED, allowZip64=True):
-        pass
-    
-    # Process all files sequentially
     print("\nProcessing files...")
     pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Overall progress")
     processed_size = 0
+    unreported_size = 0
+    
+    def advance(size):
+        """Count a finished file, updating the overall bar in PROGRESS_BATCH_SIZE steps."""
+        nonlocal processed_size, unreported_size
+        processed_size += size
+        unreported_size += size
+        if unreported_size >= PROGRESS_BATCH_SIZE:
+            pbar.update(unreported_size)
+            unreported_size = 0
     
-    for file_info in all_files:
+    # Reserve the output's blocks up front, then open the zip once with ZIP64 support;
+    # every entry is appended to this handle
+    reserve = total_size + len(all_files) * ZIP_ENTRY_OVERHEAD
+    with open_preallocated(output_zip, reserve) as output_file, \
+            zipfile.ZipFile(output_file, 'w', zipfile.ZIP_STORED if not compress else zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        pool = ProcessPoolExecutor(max_workers=workers) if compress and workers > 1 else None
+        uring = UringBatchReader() if pool is None and use_uring and uring_supported() else None
+        pending = deque()
+        batch = []
+        batch_size = 0
+        
+        def write_batch():
+            """Read the batched small files with io_uring and write them in order."""
+            nonlocal batch_size
+            for file_info, data in zip(batch, uring.read(batch) if batch else []):
+                try:
+                    if isinstance(data, Exception):
+                        raise data
+                    payload = _compress_bytes(data, codec, deflate_level) if compress else data
+                    _write_compressed_entry(zf, file_info[1], zlib.crc32(data), payload, len(data),
+                                            compress_type if compress else zipfile.ZIP_STORED)
+                    advance(file_info[2])
+                except Exception as e:
+                    print(f"\nError processing {file_info[0]}: {str(e)}")
+            batch.clear()
+            batch_size = 0
+        
+        def write_pending(limit):
+            """Write finished pool results in submission order until at most limit remain."""
+            while len(pending) > limit:
+                future, file_info = pending.popleft()
+                try:
+                    _write_compressed_entry(zf, file_info[1], *future.result(), compress_type)
+                    advance(file_info[2])
+                except Exception as e:
+                    print(f"\nError processing {file_info[0]}: {str(e)}")
+        
         try:
-            process_single_file(file_info, output_zip, compress, available_memory)
-            processed_size += file_info[2]
-            pbar.update(file_info[2])
-        except Exception as e:
-            print(f"\nError processing {file_info[0]}: {str(e)}")
-            # Continue with next file even if one fails
-            continue
+            for file_info in all_files:
+                if pool is not None and file_info[2] <= PARALLEL_COMPRESS_MAX_SIZE:
+                    pending.append((pool.submit(_compress_worker, file_info, codec, deflate_level), file_info))
+                    # Bound the compressed data held in memory
+                    write_pending(workers * 2)
+                    continue
+                if uring is not None and file_info[2] <= PARALLEL_COMPRESS_MAX_SIZE:
+                    batch.append(file_info)
+                    batch_size += file_info[2]
+                    if len(batch) >= uring.queue_depth or batch_size >= URING_BATCH_MAX_BYTES:
+                        write_batch()
+                    continue
+                
+                # Keep archive order: flush earlier small files before a large one
+                write_pending(0)
+                if uring is not None:
+                    write_batch()
+                try:
+                    process_single_file(file_info, zf, codec, available_memory, pbar, deflate_level, io_depth)
+                    advance(file_info[2])
+                except Exception as e:
+                    print(f"\nError processing {file_info[0]}: {str(e)}")
+                    # Continue with next file even if one fails
+                    continue
+            
+            write_pending(0)
+            if uring is not None:
+                write_batch()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if uring is not None:
+                uring.close()
     
+    pbar.update(unreported_size)
     pbar.close()
     
     elapsed = time.time() - start_time
@@ -464,23 +1173,70 @@ def zip_with_builtin(source_folder, output_zip, chunk_size=None, compress=False,
     print(f"Average speed: {total_size / elapsed / (1024**2):.2f} MB/s")
     
     # Perform quick validation if requested
-    if validate:
-        if not quick_validate_zip(source_folder, output_zip):
+    if validate or deep_validate:
+        # Reuse the scan and the written entries instead of walking the tree and
+        # reading the central directory again
+        if not quick_validate_zip(source_folder, output_zip, scan, zf.filelist):
+            return False
+    
+    if deep_validate:
+        print("Checking member CRCs...")
+        try:
+            with zipfile.ZipFile(output_zip, 'r') as zf:
+                bad_member = zf.testzip()
+        except NotImplementedError as e:
+            # e.g. zstd members on a Python whose zipfile cannot read them
+            print(f"Skipping CRC check: {e}")
+            bad_member = None
+        if bad_member is not None:
+            print(f"\nValidation failed: CRC mismatch in {bad_member}")
             return False
     
     return True
 
 
-def zip_with_7zip(source_folder, output_zip, compress=True):
-    """Use 7zip command line to create a ZIP with or without compression."""
+def zip_with_zstd(source_folder, output_path, level=ZSTD_LEVEL, threads=-1):
+    """Archive a folder as a .tar.zst stream using zstd's multithreaded compressor.
+    
+    threads=-1 uses one compression thread per CPU.
+    """
+    if not ZSTD_AVAILABLE:
+        print("zstandard not installed (pip install zstandard); use the builtin or 7zip method")
+        return False
     start_time = time.time()
     
-    # Ensure the output directory exists
-    output_dir = os.path.dirname(os.path.abspath(output_zip))
-    os.makedirs(output_dir, exist_ok=True)
+    paths, rel_paths, sizes = scan_tree(source_folder)
+    total_size = sum(sizes)
+    print(f"Starting to archive {source_folder} with zstd level {level} (Total size: {total_size / (1024**2):.2f} MB)")
     
-    # Check if 7-Zip is available
-    seven_zip_path = None
+    pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Archiving with zstd")
+    output_real = os.path.realpath(output_path)
+    try:
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+        with open(output_path, 'wb') as raw, compressor.stream_writer(raw) as writer, \
+                tarfile.open(fileobj=writer, mode='w|') as tar:
+            for file_path, rel_path, file_size in zip(paths, rel_paths, sizes):
+                if os.path.realpath(file_path) == output_real:
+                    continue  # Don't archive the archive being written
+                try:
+                    tar.add(file_path, arcname=rel_path, recursive=False)
+                except OSError as e:
+                    print(f"\nError processing {file_path}: {str(e)}")
+                pbar.update(file_size)
+    except Exception as e:
+        print(f"Error creating {output_path}: {str(e)}")
+        return False
+    finally:
+        pbar.close()
+    
+    elapsed = time.time() - start_time
+    print(f"\nArchive completed in {elapsed:.2f} seconds")
+    print(f"Average speed: {total_size / max(elapsed, 1e-9) / (1024**2):.2f} MB/s")
+    return True
+
+
+def find_7zip():
+    """Return the 7-Zip executable to run, or None if it is not installed."""
     if platform.system() == "Windows":
         possible_paths = [
             r"C:\Program Files\7-Zip\7z.exe",
@@ -488,16 +1244,24 @@ def zip_with_7zip(source_folder, output_zip, compress=True):
         ]
         for path in possible_paths:
             if os.path.exists(path):
-                seven_zip_path = path
-                break
-    else:  # For Linux/Mac
-        try:
-            # Check if 7z is in PATH
-            subprocess.run(["7z"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            seven_zip_path = "7z"
-        except FileNotFoundError:
-            pass
+                return path
+    # Check if 7z is in PATH
+    return shutil.which("7z")
+
+
+def zip_with_7zip(source_folder, output_zip, compress=True, solid=False):
+    """Use 7zip command line to create a ZIP with or without compression.
+    
+    With solid set, a solid .7z archive is written instead, since zip has no solid mode.
+    """
+    start_time = time.time()
+    
+    # Ensure the output directory exists
+    output_dir = os.path.dirname(os.path.abspath(output_zip))
+    os.makedirs(output_dir, exist_ok=True)
     
+    # Check if 7-Zip is available
+    seven_zip_path = find_7zip()
     if not seven_zip_path:
         print("7-Zip not found. Please install 7-Zip or use the built-in option.")
         return False
@@ -507,54 +1271,55 @@ def zip_with_7zip(source_folder, output_zip, compress=True):
     print(f"Starting to zip {source_folder} with 7-Zip {compression_str}...")
     
     # Calculate total size for progress bar
-    total_size = sum(os.path.getsize(os.path.join(dirpath, filename))
-                    for dirpath, _, filenames in os.walk(source_folder)
-                    for filename in filenames)
+    _, _, sizes = scan_tree(source_folder)
+    total_size = sum(sizes)
     
     # Build the 7z command
     # -mx0: No compression, -mx9: Maximum compression
     compression_level = "0" if not compress else "9"
-    cmd = [seven_zip_path, "a", "-tzip", f"-mx{compression_level}", "-r", output_zip, f"{source_folder}/*"]
+    # -bso0: no stdout messages, -bsp2: progress to stderr, -bb0: no per-file log
+    cmd = [seven_zip_path, "a", "-t7z" if solid else "-tzip", "-bso0", "-bsp2", "-bb0", f"-mx{compression_level}"]
+    if solid:
+        # Compress files as one stream with all CPUs; pays off most on many small files
+        cmd += ["-ms=on", "-mmt=on"]
+    cmd += ["-r", output_zip, f"{source_folder}/*"]
     
     try:
-        # Run 7z with real-time output
-        process = subprocess.Popen(
-            cmd, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
-        )
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         
         # Create progress bar
         pbar = tqdm(total=total_size, unit='B', unit_scale=True, desc="Zipping with 7-Zip")
         bytes_processed = 0
+        messages = deque(maxlen=20)  # Last non-progress output, shown if 7-Zip fails
+        pending = b''
         
-        # Display output in real-time and update progress
-        for line in process.stdout:
-            print(line.strip())
-            # Try to extract progress information from 7-Zip output
-            if "Compressing" in line:
-                try:
-                    # Extract the size information from the line
-                    size_str = line.split()[-1]
-                    if size_str.endswith('B'):
-                        size = float(size_str[:-1])
-                        if 'K' in size_str:
-                            size *= 1024
-                        elif 'M' in size_str:
-                            size *= 1024 * 1024
-                        elif 'G' in size_str:
-                            size *= 1024 * 1024 * 1024
-                        pbar.update(int(size) - bytes_processed)
-                        bytes_processed = int(size)
-                except:
-                    pass
+        # 7-Zip redraws its percentage with \r or backspaces; read raw blocks and keep the latest
+        fd = process.stderr.fileno()
+        while True:
+            block = os.read(fd, 4096)
+            if not block:
+                break
+            parts = _PROGRESS_SPLIT_RE.split(pending + block)
+            pending = parts.pop()
+            for part in parts:
+                match = _PROGRESS_RE.match(part)
+                if match:
+                    size = int(match.group(1)) * total_size // 100
+                    if size > bytes_processed:
+                        pbar.update(size - bytes_processed)
+                        bytes_processed = size
+                elif part.strip():
+                    messages.append(part.strip().decode(errors='replace'))
+        if pending.strip() and not _PROGRESS_RE.match(pending):
+            messages.append(pending.strip().decode(errors='replace'))
         
         process.wait()
         pbar.close()
         
         if process.returncode != 0:
             print(f"7-Zip failed with return code {process.returncode}")
+            for message in messages:
+                print(message)
             return False
         
         elapsed = time.time() - start_time
@@ -566,8 +1331,12 @@ def zip_with_7zip(source_folder, output_zip, compress=True):
         return False
 
 
-def run_performance_test(chunk_size=8192, test_folder=None):
-    """Run a performance test with either sample data or a specified folder."""
+def run_performance_test(chunk_size=8192, test_folder=None, realistic_content=False):
+    """Run a performance test with either sample data or a specified folder.
+    
+    Sample files are created sparse (instant, read back as zeros without disk I/O)
+    unless realistic_content is set, in which case every byte is written.
+    """
     print("Running performance test...")
     
     # Initialize results dictionary
@@ -584,24 +1353,10 @@ def run_performance_test(chunk_size=8192, test_folder=None):
         
         print(f"Calculating total size of {test_folder}...")
         
-        # First count total files for progress bar
-        total_files = sum(len(files) for _, _, files in os.walk(test_folder))
-        pbar_files = tqdm(total=total_files, unit='file', desc="Counting files")
-        
-        # Calculate total size of the folder with progress
-        total_size = 0
-        file_count = 0
-        for dirpath, _, filenames in os.walk(test_folder):
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                try:
-                    total_size += os.path.getsize(file_path)
-                except (OSError, PermissionError) as e:
-                    print(f"\nWarning: Could not access {file_path}: {str(e)}")
-                file_count += 1
-                pbar_files.update(1)
-        
-        pbar_files.close()
+        # One scan gives both the file count and the total size
+        paths, _, sizes = scan_tree(test_folder)
+        file_count = len(paths)
+        total_size = sum(sizes)
         total_size_mb = total_size / (1024 * 1024)
         
         print(f"\nFound {file_count} files")
@@ -664,19 +1419,22 @@ def run_performance_test(chunk_size=8192, test_folder=None):
                 
                 print(f"\nCreating test file of {size_display:.1f} {unit}...")
                 
-                # Create file efficiently without loading it all into memory
                 with open(test_file, 'wb') as f:
-                    # Write in chunks of 1MB
-                    chunk = b'0' * 1024 * 1024
-                    mb_written = 0
-                    
-                    # Create progress bar for file writing
-                    with tqdm(total=size_mb, unit='MB', unit_scale=True, 
-                             desc=f"Writing {size_display:.1f}{unit} test file") as pbar:
-                        while mb_written < size_mb:
-                            f.write(chunk)
-                            mb_written += 1
-                            pbar.update(1)
+                    if not realistic_content:
+                        # Sparse file: sets the size without writing any blocks
+                        f.truncate(size_bytes)
+                    else:
+                        # Write in chunks of 1MB
+                        chunk = b'0' * 1024 * 1024
+                        mb_written = 0
+                        
+                        # Create progress bar for file writing
+                        with tqdm(total=size_mb, unit='MB', unit_scale=True, 
+                                 desc=f"Writing {size_display:.1f}{unit} test file") as pbar:
+                            while mb_written < size_mb:
+                                f.write(chunk)
+                                mb_written += 1
+                                pbar.update(1)
                 
                 # Verify input file size
                 input_size = os.path.getsize(test_file)
@@ -733,38 +1491,70 @@ def run_performance_test(chunk_size=8192, test_folder=None):
     print("\nPerformance test completed")
 
 
+def _probe(path: str) -> Tuple[bool, bool]:
+    """Return (exists, is_dir) for path from a single stat call."""
+    try:
+        return True, stat.S_ISDIR(os.stat(path).st_mode)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, False
+
+
 def main():
     parser = argparse.ArgumentParser(description='Zip a folder with or without compression, optimized for memory efficiency')
     parser.add_argument('--source', help='Source folder to zip')
     parser.add_argument('--output', help='Output zip file')
-    parser.add_argument('--method', choices=['builtin', '7zip'], default='builtin',
-                        help='Zipping method: Python built-in or 7-Zip (default: builtin)')
+    parser.add_argument('--method', choices=['builtin', '7zip', 'zstd'],
+                        help='Archiving method: Python built-in zip, 7-Zip, or a zstd-compressed .tar.zst '
+                             '(default: 7zip if installed, else builtin)')
     parser.add_argument('--chunk-size', type=int,
                         help='Chunk size in bytes for processing (default: auto-calculated based on available memory)')
     parser.add_argument('--validate', action='store_true', default=True,
                         help='Validate zip integrity after creation (default: True)')
+    parser.add_argument('--deep-validate', action='store_true',
+                        help='Also read the finished zip back and check every member against its CRC (builtin method)')
     parser.add_argument('--test-performance', action='store_true',
                         help='Run a performance test with sample data')
+    parser.add_argument('--realistic-content', action='store_true',
+                        help='With --test-performance, write every byte of the sample files instead of creating them sparse')
     parser.add_argument('--test-folder', type=str,
                         help='Specify a folder to test performance on instead of creating sample data')
     parser.add_argument('--compress', action='store_true', default=False,
                         help='Enable compression (default: no compression)')
+    parser.add_argument('--solid', action='store_true',
+                        help='With --method 7zip, write a solid multithreaded .7z archive instead of a zip')
+    parser.add_argument('--codec', choices=CODECS,
+                        help='Builtin method codec: store, deflate or zstd (default: deflate with --compress, else store)')
+    parser.add_argument('--deflate-level', type=int, choices=range(1, 13), default=DEFAULT_DEFLATE_LEVEL,
+                        metavar='{1..12}',
+                        help='DEFLATE level for the builtin method; 10-12 need libdeflate (default: 6)')
+    parser.add_argument('--zstd-level', type=int, default=ZSTD_LEVEL,
+                        help=f'Compression level for --method zstd (default: {ZSTD_LEVEL})')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Print system memory details and log every file found or skipped while scanning')
+    parser.add_argument('--io-depth', type=int, default=STREAM_WRITE_QUEUE_SIZE,
+                        help='Compressed chunks queued for the writer thread when streaming large files '
+                             f'(default: {STREAM_WRITE_QUEUE_SIZE})')
+    parser.add_argument('--workers', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Processes used to compress small files in parallel with --compress (default: CPU count)')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(message)s')
     
-    # Print detailed memory information
-    print_memory_info()
+    # Print detailed memory information (reads /proc and psutil, so only on request)
+    if args.verbose:
+        print_memory_info()
     
     # Set chunk size at the start
     if args.chunk_size is not None:
-        chunk_size = args.chunk_size
+        chunk_size = _align_to_page(args.chunk_size)
         print(f"\nUsing specified chunk size: {chunk_size / 1024:.1f} KB")
     else:
         chunk_size = get_recommended_chunk_size()
         print(f"\nUsing recommended chunk size: {chunk_size / 1024:.1f} KB")
     
     if args.test_performance:
-        run_performance_test(chunk_size=chunk_size, test_folder=args.test_folder)
+        run_performance_test(chunk_size=chunk_size, test_folder=args.test_folder,
+                             realistic_content=args.realistic_content)
         return
     
     if not args.source or not args.output:
@@ -774,36 +1564,80 @@ def main():
     source_folder = os.path.abspath(args.source)
     output_zip = os.path.abspath(args.output)
     
-    # If output path is a directory or doesn't end with .zip, append .zip
-    if os.path.isdir(output_zip) or not output_zip.lower().endswith('.zip'):
-        if os.path.isdir(output_zip):
-            # If it's a directory, use the source folder name as the zip name
-            source_name = os.path.basename(source_folder)
-            output_zip = os.path.join(output_zip, f"{source_name}.zip")
+    if args.codec is not None:
+        args.compress = args.codec != 'store'
+    if args.method is None:
+        # 7-Zip is multithreaded and much faster; --codec only applies to the builtin method
+        if args.codec is None and find_7zip():
+            args.method = '7zip'
+            print("7-Zip found; using the 7zip method (pass --method builtin to override)")
         else:
-            # If it doesn't end with .zip, append it
-            output_zip = f"{output_zip}.zip"
+            args.method = 'builtin'
+    # The zstd method writes a zstd-compressed tarball and --solid a .7z rather than a zip
+    if args.method == 'zstd':
+        extension = '.tar.zst'
+    elif args.method == '7zip' and args.solid:
+        extension = '.7z'
+    else:
+        extension = '.zip'
+    
+    # One stat per path, reused for every check below
+    _, output_is_dir = _probe(output_zip)
+    
+    # If output path is a directory, name the archive after the source folder;
+    # otherwise append the extension if it is missing (lowercasing only the suffix)
+    if output_is_dir:
+        output_zip = os.path.join(output_zip, f"{os.path.basename(source_folder)}{extension}")
+        print(f"Output path adjusted to: {output_zip}")
+    elif output_zip[-len(extension):].lower() != extension:
+        output_zip = f"{output_zip}{extension}"
         print(f"Output path adjusted to: {output_zip}")
     
-    if not os.path.exists(source_folder):
+    source_exists, _ = _probe(source_folder)
+    if not source_exists:
         print(f"Error: Source folder '{source_folder}' does not exist")
         return
     
-    # Ensure output directory exists
-    os.makedirs(os.path.dirname(output_zip), exist_ok=True)
+    # Ensure output directory exists (it does if the output was given as a directory)
+    output_dir = os.path.dirname(output_zip)
+    if not output_is_dir and not _probe(output_dir)[0]:
+        os.makedirs(output_dir, exist_ok=True)
     
+    if args.method == 'zstd':
+        args.compress = True
     compression_status = "with compression" if args.compress else "without compression"
     print(f"Memory-efficient zipping {compression_status}")
     print(f"Source: {source_folder}")
     print(f"Output: {output_zip}")
     print(f"Method: {args.method}")
-    print(f"Validation: {'enabled' if args.validate else 'disabled'}")
-    
-    success = False
-    if args.method == '7zip':
-        success = zip_with_7zip(source_folder, output_zip, args.compress)
+    # quick_validate_zip reads zip central directories, so .7z and .tar.zst output is not validated
+    validate = args.validate and extension == '.zip'
+    if args.validate and not validate:
+        print(f"Validation: skipped for {extension} output")
     else:
-        success = zip_with_builtin(source_folder, output_zip, chunk_size, args.compress, args.validate)
+        print(f"Validation: {'enabled' if validate else 'disabled'}")
+    
+    def run_builtin():
+        # A handful of files is faster with plain reads in this process than with
+        # io_uring or worker pool startup
+        workers, use_uring = args.workers, True
+        if count_files(source_folder, FAST_PATH_MAX_FILES) < FAST_PATH_MAX_FILES:
+            workers, use_uring = 1, False
+        return zip_with_builtin(source_folder, output_zip, chunk_size, args.compress, validate, workers, args.codec,
+                                args.deflate_level, use_uring, args.deep_validate, args.io_depth)
+    
+    def run_7zip():
+        if not zip_with_7zip(source_folder, output_zip, args.compress, args.solid):
+            return False
+        return not validate or quick_validate_zip(source_folder, output_zip)
+    
+    # One entry per --method choice
+    methods = {
+        'builtin': run_builtin,
+        '7zip': run_7zip,
+        'zstd': lambda: zip_with_zstd(source_folder, output_zip, args.zstd_level),
+    }
+    success = methods[args.method]()
     
     if not success:
         print("Operation failed!")